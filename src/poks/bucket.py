@@ -2,6 +2,9 @@
 
 import hashlib
 import json
+import os
+import tempfile
+from functools import lru_cache
 from pathlib import Path
 
 from git import Repo
@@ -11,6 +14,7 @@ from py_app_dev.core.logging import logger
 from poks.domain import PoksBucket, PoksBucketRegistry
 
 
+@lru_cache(maxsize=256)
 def get_bucket_id(url: str) -> str:
     """Generate a deterministic ID from the bucket URL."""
     # Normalize URL by removing trailing slash and .git suffix for consistency
@@ -22,10 +26,10 @@ def get_bucket_id(url: str) -> str:
 
 def load_registry(registry_path: Path) -> PoksBucketRegistry:
     """Load the bucket registry from a file."""
-    if not registry_path.exists():
-        return PoksBucketRegistry()
     try:
         return PoksBucketRegistry.from_json_file(registry_path)
+    except FileNotFoundError:
+        return PoksBucketRegistry()
     except json.JSONDecodeError as e:
         logger.warning(f"Registry file at {registry_path} is corrupted: {e}")
         return PoksBucketRegistry()
@@ -34,11 +38,23 @@ def load_registry(registry_path: Path) -> PoksBucketRegistry:
         return PoksBucketRegistry()
 
 
+def _write_text_atomic(path: Path, content: str) -> None:
+    """Write *content* to a sibling temp file and atomically replace *path* with it."""
+    fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "w") as fh:
+            fh.write(content)
+        os.replace(tmp_name, path)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+
+
 def save_registry(registry: PoksBucketRegistry, registry_path: Path) -> None:
-    """Save the bucket registry to a file."""
+    """Save the bucket registry atomically so concurrent readers never see a partial file."""
     try:
         registry_path.parent.mkdir(parents=True, exist_ok=True)
-        registry.to_json_file(registry_path)
+        _write_text_atomic(registry_path, registry.to_json_string())
     except OSError as e:
         logger.error(f"Failed to save registry to {registry_path}: {e}")
     except Exception as e:
@@ -124,19 +140,35 @@ def search_all_buckets(app_name: str, buckets_dir: Path) -> tuple[Path, str]:
         FileNotFoundError: If no buckets exist or manifest not found in any bucket.
 
     """
-    if not buckets_dir.exists() or not any(buckets_dir.iterdir()):
+    bucket_dirs = _bucket_dirs(buckets_dir)
+    if not bucket_dirs:
         raise FileNotFoundError("No local buckets available. Use --bucket with a URL to clone a bucket.")
 
-    for bucket_dir in buckets_dir.iterdir():
-        if not bucket_dir.is_dir():
-            continue
-        manifest_path = bucket_dir / f"{app_name}.json"
+    for bucket_dir in bucket_dirs:
+        manifest_path = Path(bucket_dir.path, f"{app_name}.json")
         if manifest_path.exists():
             return manifest_path, bucket_dir.name
 
     raise FileNotFoundError(f"Manifest '{app_name}.json' not found in any local bucket")
 
 
+def _bucket_dirs(buckets_dir: Path) -> list[os.DirEntry[str]]:
+    """Return the bucket directories under *buckets_dir* (empty if it does not exist), typed from ``os.scandir``'s ``d_type``."""
+    try:
+        with os.scandir(buckets_dir) as entries:
+            return [entry for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+
+def _list_bucket_apps(bucket_dir: str) -> list[str]:
+    """Return the app names provided by a bucket directory, in a single ``os.scandir`` pass."""
+    with os.scandir(bucket_dir) as entries:
+        names = [Path(entry.name) for entry in entries if entry.is_file()]
+    # A file named just ".json" has no suffix by pathlib's rules, so it is not mistaken for an app
+    return [name.stem for name in names if name.suffix == ".json"]
+
+
 def search_apps_in_buckets(query: str, buckets_dir: Path) -> list[str]:
     """
     Search for apps in all local buckets matching the query.
@@ -150,20 +182,12 @@ def search_apps_in_buckets(query: str, buckets_dir: Path) -> list[str]:
 
     """
     matches = set()
-    if not buckets_dir.exists():
-        return []
-
     query = query.lower()
 
-    for bucket_dir in buckets_dir.iterdir():
-        if not bucket_dir.is_dir():
-            continue
-
-        for item in bucket_dir.iterdir():
-            if item.suffix == ".json" and item.is_file():
-                app_name = item.stem
-                if query in app_name.lower():
-                    matches.add(app_name)
+    for bucket_dir in _bucket_dirs(buckets_dir):
+        for app_name in _list_bucket_apps(bucket_dir.path):
+            if query in app_name.lower():
+                matches.add(app_name)
 
     return sorted(matches)
 
@@ -176,13 +200,8 @@ def update_local_buckets(buckets_dir: Path) -> None:
         buckets_dir: Directory containing local buckets.
 
     """
-    if not buckets_dir.exists():
-        return
-
-    for bucket_dir in buckets_dir.iterdir():
-        if not bucket_dir.is_dir():
-            continue
-
+    for entry in _bucket_dirs(buckets_dir):
+        bucket_dir = Path(entry.path)
         # Check if it's a git repo
         if (bucket_dir / ".git").exists():
             try:
@@ -5,6 +5,7 @@ from __future__ import annotations
 import json
 import sys
 from dataclasses import dataclass, field
+from functools import cached_property
 from pathlib import Path
 
 if sys.version_info >= (3, 11):
@@ -16,7 +17,7 @@ from mashumaro.config import BaseConfig
 from mashumaro.mixins.json import DataClassJSONMixin
 
 
-@dataclass
+@dataclass(slots=True)
 class PoksJsonMixin(DataClassJSONMixin):
     """Shared mixin providing mashumaro config and JSON file I/O."""
 
@@ -25,7 +26,7 @@ class PoksJsonMixin(DataClassJSONMixin):
 
     @classmethod
     def from_json_file(cls, file_path: Path) -> Self:
-        return cls.from_dict(json.loads(file_path.read_text()))
+        return cls.from_dict(json.loads(file_path.read_bytes()))
 
     @classmethod
     def from_file(cls, file_path: Path) -> Self:
@@ -44,7 +45,7 @@ class PoksJsonMixin(DataClassJSONMixin):
         self.to_json_file(file_path)
 
 
-@dataclass
+@dataclass(slots=True)
 class PoksArchive(PoksJsonMixin):
     """A platform-specific archive entry within a manifest."""
 
@@ -58,7 +59,7 @@ class PoksArchive(PoksJsonMixin):
     env: dict[str, str] | None = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PoksAppVersion(PoksJsonMixin):
     """Specific version details for an application."""
 
@@ -95,6 +96,15 @@ class PoksManifest(PoksJsonMixin):
     license: str | None = None
     homepage: str | None = None
 
+    @cached_property
+    def versions_by_id(self) -> dict[str, PoksAppVersion]:
+        """Versions indexed by version string (first entry wins on duplicates), built on first access."""
+        return {v.version: v for v in reversed(self.versions)}
+
+    def get_version(self, version: str) -> PoksAppVersion | None:
+        """Find a version entry by its version string."""
+        return self.versions_by_id.get(version)
+
 
 @dataclass
 class PoksBucket(PoksJsonMixin):
@@ -227,19 +237,14 @@ class InstallResult:
     @property
     def dirs(self) -> list[Path]:
         """Unique bin directories across all apps, preserving config order."""
-        seen: dict[Path, None] = {}
-        for app in self.apps:
-            for d in app.bin_dirs:
-                seen.setdefault(d, None)
-        return list(seen)
+        return list(dict.fromkeys(d for app in self.apps for d in app.bin_dirs))
 
     @property
     def env(self) -> dict[str, str]:
         """Merged non-PATH environment variables from all apps (last-writer-wins on conflicts)."""
         merged: dict[str, str] = {}
         for app in self.apps:
-            for key, value in app.env.items():
-                merged[key] = value
+            merged.update(app.env)
         return merged
 
 
@@ -3,7 +3,10 @@
 from __future__ import annotations
 
 import hashlib
+import threading
+import weakref
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from urllib.request import url2pathname
 
@@ -13,8 +16,27 @@ from py_app_dev.core.logging import logger
 from poks.progress import ProgressCallback
 
 _HASH_CHUNK_SIZE = 8192
+_SCRATCH_BUFFER_SIZE = 1 << 20
 _DOWNLOAD_TIMEOUT = 60
 
+_scratch = threading.local()
+_download_locks: weakref.WeakValueDictionary[Path, threading.Lock] = weakref.WeakValueDictionary()
+_download_locks_guard = threading.Lock()
+
+
+def _scratch_buffer() -> memoryview:
+    """Return a per-thread reusable I/O buffer."""
+    buffer = getattr(_scratch, "buffer", None)
+    if buffer is None:
+        buffer = _scratch.buffer = memoryview(bytearray(_SCRATCH_BUFFER_SIZE))
+    return buffer
+
+
+def _download_lock(cached: Path) -> threading.Lock:
+    """Return the lock serializing downloads into *cached*; it is dropped once no download holds it."""
+    with _download_locks_guard:
+        return _download_locks.setdefault(cached, threading.Lock())
+
 
 class DownloadError(Exception):
     """Raised when a file download fails."""
@@ -46,28 +68,42 @@ def download_file(
         DownloadError: On HTTP or network failures.
 
     """
-    dest.parent.mkdir(parents=True, exist_ok=True)
-    if url.startswith("file://"):
-        src = Path(url2pathname(url[7:]))
-        file_size = src.stat().st_size
-        downloaded = 0
-        with src.open("rb") as src_fh, dest.open("wb") as dst_fh:
-            while chunk := src_fh.read(_HASH_CHUNK_SIZE):
-                dst_fh.write(chunk)
-                downloaded += len(chunk)
-                if progress_callback:
-                    progress_callback(app_name, downloaded, file_size)
-        return dest
-    _download_via_http(url, dest, app_name, progress_callback)
+    _download(url, dest, app_name, progress_callback)
     return dest
 
 
+def _download(
+    url: str,
+    dest: Path,
+    app_name: str,
+    progress_callback: ProgressCallback | None,
+) -> str:
+    """Download *url* to *dest* and return the SHA256 hex digest of the bytes written."""
+    dest.parent.mkdir(parents=True, exist_ok=True)
+    if not url.startswith("file://"):
+        return _download_via_http(url, dest, app_name, progress_callback)
+    sha256 = hashlib.sha256()
+    src = Path(url2pathname(url[7:]))
+    file_size = src.stat().st_size
+    downloaded = 0
+    buffer = _scratch_buffer()
+    with src.open("rb") as src_fh, dest.open("wb") as dst_fh:
+        while read := src_fh.readinto(buffer):
+            dst_fh.write(buffer[:read])
+            sha256.update(buffer[:read])
+            downloaded += read
+            if progress_callback:
+                progress_callback(app_name, downloaded, file_size)
+    return sha256.hexdigest()
+
+
 def _download_via_http(
     url: str,
     dest: Path,
     app_name: str,
     progress_callback: ProgressCallback | None,
-) -> None:
+) -> str:
+    sha256 = hashlib.sha256()
     try:
         with requests.get(url, stream=True, timeout=_DOWNLOAD_TIMEOUT) as response:
             response.raise_for_status()
@@ -77,11 +113,13 @@ def _download_via_http(
             with dest.open("wb") as fh:
                 for chunk in response.iter_content(chunk_size=_HASH_CHUNK_SIZE):
                     fh.write(chunk)
+                    sha256.update(chunk)
                     downloaded += len(chunk)
                     if progress_callback:
                         progress_callback(app_name, downloaded, total)
     except requests.RequestException as exc:
         raise DownloadError(f"Failed to download {url}: {exc}") from exc
+    return sha256.hexdigest()
 
 
 def verify_sha256(file_path: Path, expected_hash: str) -> None:
@@ -92,15 +130,25 @@ def verify_sha256(file_path: Path, expected_hash: str) -> None:
         HashMismatchError: When the computed hash differs from *expected_hash*.
 
     """
-    sha256 = hashlib.sha256()
-    with file_path.open("rb") as fh:
-        while chunk := fh.read(_HASH_CHUNK_SIZE):
-            sha256.update(chunk)
-    actual = sha256.hexdigest()
+    _check_digest(file_path, expected_hash, _file_sha256(file_path))
+
+
+def _file_sha256(file_path: Path) -> str:
+    """Return the SHA256 hex digest of a file."""
+    with file_path.open("rb", buffering=0) as fh:
+        sha256 = hashlib.sha256()
+        buffer = _scratch_buffer()
+        while read := fh.readinto(buffer):
+            sha256.update(buffer[:read])
+        return sha256.hexdigest()
+
+
+def _check_digest(file_path: Path, expected_hash: str, actual: str) -> None:
     if actual != expected_hash:
         raise HashMismatchError(f"SHA256 mismatch for {file_path.name}: expected {expected_hash}, got {actual}")
 
 
+@lru_cache(maxsize=1024)
 def _cache_path_for(url: str, cache_dir: Path) -> Path:
     """Derive a deterministic cache file path from a URL."""
     filename = Path(url.split("?")[0].rstrip("/")).name
@@ -143,15 +191,16 @@ def get_cached_or_download(
 
     """
     cached = _cache_path_for(url, cache_dir)
-    if use_cache and cached.exists():
-        try:
-            verify_sha256(cached, sha256)
-            logger.info(f"Cache hit: {cached}")
-            return DownloadResult(path=cached, downloaded=False)
-        except HashMismatchError:
-            logger.warning(f"Corrupt cache entry {cached}, re-downloading")
-            cached.unlink()
-    cache_dir.mkdir(parents=True, exist_ok=True)
-    download_file(url, cached, app_name=app_name, progress_callback=progress_callback)
-    verify_sha256(cached, sha256)
-    return DownloadResult(path=cached, downloaded=True)
+    # Parallel installs of apps sharing an archive wait here; the first downloads, the rest hit the cache
+    with _download_lock(cached):
+        if use_cache and cached.exists():
+            try:
+                _check_digest(cached, sha256, _file_sha256(cached))
+                logger.info(f"Cache hit: {cached}")
+                return DownloadResult(path=cached, downloaded=False)
+            except HashMismatchError:
+                logger.warning(f"Corrupt cache entry {cached}, re-downloading")
+                cached.unlink()
+        cache_dir.mkdir(parents=True, exist_ok=True)
+        _check_digest(cached, sha256, _download(url, cached, app_name, progress_callback))
+        return DownloadResult(path=cached, downloaded=True)
@@ -19,12 +19,11 @@ def collect_env_updates(version: PoksAppVersion, install_dir: Path) -> dict[str,
     """
     result: dict[str, str] = {}
     if version.bin_dirs:
-        paths = [str(install_dir / entry) for entry in version.bin_dirs]
-        result["PATH"] = os.pathsep.join(paths)
+        # Joined through pathlib on purpose: it normalizes separators and "./" segments per OS
+        result["PATH"] = os.pathsep.join([str(install_dir / entry) for entry in version.bin_dirs])
     if version.env:
         dir_str = str(install_dir)
-        for key, value in version.env.items():
-            result[key] = value.replace("${dir}", dir_str)
+        result.update({key: value.replace("${dir}", dir_str) for key, value in version.env.items()})
     return result
 
 
@@ -36,13 +35,15 @@ def merge_env_updates(updates: list[dict[str, str]]) -> dict[str, str]:
     keys, last writer wins and a warning is emitted on conflicts.
     """
     merged: dict[str, str] = {}
+    path_entries: list[str] = []
     for env in updates:
         for key, value in env.items():
             if key == "PATH":
-                merged[key] = os.pathsep.join(filter(None, [merged.get(key), value]))
-            elif key in merged and merged[key] != value:
+                path_entries.append(value)
+                continue
+            if key in merged and merged[key] != value:
                 logger.warning(f"Conflicting env var {key!r}: overwriting {merged[key]!r} with {value!r}")
-                merged[key] = value
-            else:
-                merged[key] = value
+            merged[key] = value
+    if path_entries:
+        merged["PATH"] = os.pathsep.join(filter(None, path_entries))
     return merged
@@ -2,16 +2,19 @@
 
 from __future__ import annotations
 
-import io
 import json
+import os
 import shutil
 import tarfile
+import tempfile
+import threading
 import time
 import zipfile
-from collections.abc import Generator
+from collections.abc import Callable, Generator
 from contextlib import contextmanager
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Any, Literal, cast
+from typing import Any, BinaryIO, Literal, cast
 
 import py7zr
 import zstandard
@@ -29,9 +32,24 @@ SUPPORTED_FORMATS: dict[str, str] = {
     ".txz": "tar:xz",
     ".tar.bz2": "tar:bz2",
     ".tbz2": "tar:bz2",
+    ".tar.zst": "tar:zst",
+    ".tzst": "tar:zst",
     ".7z": "7z",
 }
 
+_ARCHIVE_READ_BUFFER_SIZE = 1 << 20
+# tarfile enforces path safety itself via filter="data" (3.12, backported to 3.11.4 and 3.10.12)
+_HAS_TAR_DATA_FILTER = hasattr(tarfile, "data_filter")
+_zstd = threading.local()
+
+
+def _zstd_decompressor() -> zstandard.ZstdDecompressor:
+    """Return a per-thread zstd decompression context; contexts are reusable but not safe to share across threads."""
+    dctx = getattr(_zstd, "dctx", None)
+    if dctx is None:
+        dctx = _zstd.dctx = zstandard.ZstdDecompressor()
+    return dctx
+
 
 def _detect_format(archive_path: Path) -> str:
     """Return the format key for the given archive path based on its suffix(es)."""
@@ -43,28 +61,80 @@ def _detect_format(archive_path: Path) -> str:
     raise ValueError(f"Unsupported archive format: {archive_path.name}. Supported: {supported}")
 
 
+def _entry_path_validator(dest_dir: Path) -> Callable[[str], None]:
+    """
+    Return a check that rejects archive entries escaping *dest_dir* via path traversal.
+
+    The strategy is chosen once per archive: while *dest_dir* is empty there are no
+    symlinks under it, so entries are checked lexically against the destination,
+    resolved once; otherwise every entry is resolved through the filesystem.
+    """
+    resolved_dest = os.path.realpath(dest_dir)
+    prefix = os.path.join(resolved_dest, "")
+    lexical = not any(dest_dir.iterdir())
+
+    def validate(name: str) -> None:
+        target = os.path.normpath(os.path.join(resolved_dest, name)) if lexical else os.path.realpath(dest_dir / name)
+        if target != resolved_dest and not target.startswith(prefix):
+            raise ValueError(f"Path traversal detected in archive entry: {name!r}")
+
+    return validate
+
+
 def _validate_entry_paths(names: list[str], dest_dir: Path) -> None:
     """Reject archive entries that would escape *dest_dir* via path traversal."""
-    resolved_dest = dest_dir.resolve()
+    validate = _entry_path_validator(dest_dir)
     for name in names:
-        target = (dest_dir / name).resolve()
-        if not target.is_relative_to(resolved_dest):
-            raise ValueError(f"Path traversal detected in archive entry: {name!r}")
+        validate(name)
+
+
+@dataclass
+class _ExtractDirRebase:
+    """Strips the ``extract_dir`` prefix from entry names during extraction, so its contents land directly in the destination."""
+
+    prefix: str
+    matched: bool = False
+
+    def rebase(self, name: str, is_dir: bool = False) -> str | None:
+        """Return *name* relative to extract_dir, or None for the extract_dir directory entry itself."""
+        if is_dir and name.rstrip("/") + "/" == self.prefix:
+            self.matched = True
+            return None
+        if name.startswith(self.prefix):
+            self.matched = True
+            return name[len(self.prefix) :]
+        return name
+
+
+def _rebase_tar_member(member: tarfile.TarInfo, rebase: _ExtractDirRebase) -> bool:
+    """Rewrite *member* in place; return False when it is the extract_dir entry itself and must be skipped."""
+    name = rebase.rebase(member.name, member.isdir())
+    if name is None:
+        return False
+    member.name = name
+    if member.islnk():
+        member.linkname = rebase.rebase(member.linkname) or member.linkname
+    return True
+
+
+def _rebase_zip_member(member: zipfile.ZipInfo, rebase: _ExtractDirRebase) -> bool:
+    """Rewrite *member* in place; return False when it is the extract_dir entry itself and must be skipped."""
+    name = rebase.rebase(member.filename, member.is_dir())
+    if name is None:
+        return False
+    member.filename = name
+    return True
 
 
 @contextmanager
 def _open_archive(archive_path: Path, fmt: str) -> Generator[Any, None, None]:
-    """Open an archive file and yield the archive object."""
+    """Open a zip or 7z archive file and yield the archive object."""
     if fmt == "zip":
-        with zipfile.ZipFile(archive_path) as zf:
+        with archive_path.open("rb", buffering=_ARCHIVE_READ_BUFFER_SIZE) as fh, zipfile.ZipFile(fh) as zf:
             yield zf
-    elif fmt == "7z":
+    else:
         with py7zr.SevenZipFile(archive_path, mode="r") as sz:
             yield sz
-    else:
-        tar_mode = cast(Literal["r:gz", "r:xz", "r:bz2"], f"r:{fmt.split(':')[1]}")
-        with tarfile.open(archive_path, tar_mode) as tf:
-            yield tf
 
 
 def _extract_all(
@@ -73,14 +143,16 @@ def _extract_all(
     dest_dir: Path,
     progress_callback: ProgressCallback | None = None,
     app_name: str = "",
+    rebase: _ExtractDirRebase | None = None,
 ) -> None:
-    """Extract all contents of an archive into dest_dir after validating paths."""
+    """Extract all contents of an archive into dest_dir after validating paths; only zip entries are rebased."""
     if fmt == "zip":
         members = archive.infolist()
         _validate_entry_paths(archive.namelist(), dest_dir)
         total = len(members)
         for idx, member in enumerate(members, 1):
-            archive.extract(member, dest_dir)
+            if not rebase or _rebase_zip_member(member, rebase):
+                archive.extract(member, dest_dir)
             if progress_callback:
                 progress_callback(app_name, idx, total)
     elif fmt == "7z":
@@ -89,20 +161,65 @@ def _extract_all(
         archive.extractall(path=dest_dir)  # noqa: S202
         if progress_callback:
             progress_callback(app_name, len(names), len(names))
-    else:
-        members = archive.getmembers()
-        total = len(members)
-        if hasattr(tarfile, "data_filter"):
-            for idx, member in enumerate(members, 1):
-                archive.extract(member, dest_dir, filter="data")
-                if progress_callback:
-                    progress_callback(app_name, idx, total)
-        else:
-            _validate_entry_paths([m.name for m in members], dest_dir)
-            for idx, member in enumerate(members, 1):
-                archive.extract(member, dest_dir)
-                if progress_callback:
-                    progress_callback(app_name, idx, total)
+
+
+@contextmanager
+def _zstd_seekable(fh: BinaryIO) -> Generator[BinaryIO, None, None]:
+    """Decompress a zstd stream into a temporary file and yield it rewound, so tarfile can seek in it."""
+    with tempfile.TemporaryFile() as tmp:
+        _zstd_decompressor().copy_stream(fh, tmp)
+        tmp.seek(0)
+        yield tmp
+
+
+@contextmanager
+def _open_tar(fh: BinaryIO, compression: str) -> Generator[tarfile.TarFile, None, None]:
+    """
+    Open *fh* as a seekable tarball; tarfile has no zstd codec, so zstd is decompressed first.
+
+    Stream mode is not an option: when a symlink cannot be created (e.g. Windows
+    without the symlink privilege) tarfile extracts the link target instead, which
+    needs to seek back to that member.
+    """
+    if compression == "zst":
+        with _zstd_seekable(fh) as tar_fh, tarfile.open(fileobj=tar_fh, mode="r:") as tf:
+            yield tf
+        return
+    mode = cast(Literal["r:gz", "r:xz", "r:bz2"], f"r:{compression}")
+    with tarfile.open(fileobj=fh, mode=mode) as tf:
+        yield tf
+
+
+def _extract_tar(
+    archive_path: Path,
+    compression: str,
+    dest_dir: Path,
+    progress_callback: ProgressCallback | None = None,
+    app_name: str = "",
+    rebase: _ExtractDirRebase | None = None,
+) -> None:
+    """
+    Extract a compressed tarball member by member through a large read buffer.
+
+    Members are read as they are reached rather than listed up front, so progress
+    is reported in compressed bytes consumed.
+    """
+    total = archive_path.stat().st_size
+    validate = None if _HAS_TAR_DATA_FILTER else _entry_path_validator(dest_dir)
+    with archive_path.open("rb", buffering=_ARCHIVE_READ_BUFFER_SIZE) as fh, _open_tar(fh, compression) as tf:
+        for member in tf:
+            if rebase and not _rebase_tar_member(member, rebase):
+                continue
+            if validate is None:
+                tf.extract(member, dest_dir, filter="data")
+            else:
+                validate(member.name)
+                tf.extract(member, dest_dir)
+            # The final report is sent after the loop; an early "complete" would close the progress task
+            if progress_callback and (consumed := fh.tell()) < total:
+                progress_callback(app_name, consumed, total)
+    if progress_callback:
+        progress_callback(app_name, total, total)
 
 
 def _rename_with_retry(src: Path, dst: Path, retries: int = 5, delay_seconds: float = 1.0) -> None:
@@ -118,6 +235,14 @@ def _rename_with_retry(src: Path, dst: Path, retries: int = 5, delay_seconds: fl
                 raise
 
 
+def _checked_extract_dir(dest_dir: Path, extract_dir: str) -> Path:
+    """Return dest_dir/extract_dir, rejecting values that point outside dest_dir."""
+    source = dest_dir / extract_dir
+    if not source.resolve().is_relative_to(dest_dir.resolve()):
+        raise ValueError(f"extract_dir '{extract_dir}' escapes destination directory")
+    return source
+
+
 def _relocate_extract_dir(dest_dir: Path, extract_dir: str) -> None:
     """
     Move contents of dest_dir/extract_dir into dest_dir.
@@ -125,9 +250,7 @@ def _relocate_extract_dir(dest_dir: Path, extract_dir: str) -> None:
     Uses a temporary rename to avoid conflicts when a child inside
     extract_dir has the same name as extract_dir itself.
     """
-    source = dest_dir / extract_dir
-    if not source.resolve().is_relative_to(dest_dir.resolve()):
-        raise ValueError(f"extract_dir '{extract_dir}' escapes destination directory")
+    source = _checked_extract_dir(dest_dir, extract_dir)
     if not source.is_dir():
         raise ValueError(f"extract_dir '{extract_dir}' not found in extracted archive")
     staging = dest_dir / f".poks_tmp_{extract_dir}"
@@ -137,41 +260,39 @@ def _relocate_extract_dir(dest_dir: Path, extract_dir: str) -> None:
     staging.rmdir()
 
 
-def _decompress_zstd(data: bytes) -> bytes:
-    """Decompress zstandard-compressed bytes."""
-    dctx = zstandard.ZstdDecompressor()
-    return dctx.decompress(data, max_output_size=256 * 1024 * 1024)
+@contextmanager
+def _open_tar_zst_member(zf: zipfile.ZipFile, name: str) -> Generator[tarfile.TarFile, None, None]:
+    """Open a ``.tar.zst`` entry of a zip as a seekable tarball, decompressing it to a temporary file."""
+    with zf.open(name) as raw, _open_tar(cast(BinaryIO, raw), "zst") as tf:
+        yield tf
 
 
-def _extract_tar_from_bytes(data: bytes, dest_dir: Path) -> None:
-    """Extract a tar archive from raw bytes into dest_dir with path validation."""
-    with tarfile.open(fileobj=io.BytesIO(data), mode="r:") as tf:
-        if hasattr(tarfile, "data_filter"):
-            tf.extractall(dest_dir, filter="data")
-        else:
-            _validate_entry_paths([member.name for member in tf.getmembers()], dest_dir)
-            tf.extractall(dest_dir)  # noqa: S202
-
-
-def _parse_conda_patches(info_tar_zst_bytes: bytes) -> list[PatchEntry]:
-    """Parse paths.json from a conda info tar.zst and return patch entries."""
-    tar_bytes = _decompress_zstd(info_tar_zst_bytes)
-    with tarfile.open(fileobj=io.BytesIO(tar_bytes), mode="r:") as tf:
-        for member in tf.getmembers():
-            if member.name.endswith("paths.json") or member.name == "paths.json":
-                extracted = tf.extractfile(member)
-                if extracted is None:
-                    continue
-                paths_data = json.loads(extracted.read())
-                return [
-                    PatchEntry(
-                        path=entry["_path"],
-                        prefix_placeholder=entry["prefix_placeholder"],
-                        file_mode=entry["file_mode"],
-                    )
-                    for entry in paths_data.get("paths", [])
-                    if "prefix_placeholder" in entry and "file_mode" in entry
-                ]
+def _extract_tar_members(tf: tarfile.TarFile, dest_dir: Path) -> None:
+    """Extract a tarball into dest_dir with path validation."""
+    if _HAS_TAR_DATA_FILTER:
+        tf.extractall(dest_dir, filter="data")
+        return
+    _validate_entry_paths(tf.getnames(), dest_dir)
+    tf.extractall(dest_dir)  # noqa: S202
+
+
+def _parse_conda_patches(tf: tarfile.TarFile) -> list[PatchEntry]:
+    """Parse paths.json from a conda info tarball and return patch entries."""
+    for member in tf:
+        if member.name.endswith("paths.json") or member.name == "paths.json":
+            extracted = tf.extractfile(member)
+            if extracted is None:
+                continue
+            paths_data = json.loads(extracted.read())
+            return [
+                PatchEntry(
+                    path=entry["_path"],
+                    prefix_placeholder=entry["prefix_placeholder"],
+                    file_mode=entry["file_mode"],
+                )
+                for entry in paths_data.get("paths", [])
+                if "prefix_placeholder" in entry and "file_mode" in entry
+            ]
     return []
 
 
@@ -185,12 +306,10 @@ def _extract_conda(archive_path: Path, dest_dir: Path) -> None:
         if not pkg_members:
             raise ValueError(f"Invalid .conda archive: no pkg-*.tar.zst found in {archive_path.name}")
         if info_members:
-            info_data = zf.read(info_members[0])
-            patches = _parse_conda_patches(info_data)
-        pkg_data = zf.read(pkg_members[0])
-
-    pkg_tar_bytes = _decompress_zstd(pkg_data)
-    _extract_tar_from_bytes(pkg_tar_bytes, dest_dir)
+            with _open_tar_zst_member(zf, info_members[0]) as tf:
+                patches = _parse_conda_patches(tf)
+        with _open_tar_zst_member(zf, pkg_members[0]) as tf:
+            _extract_tar_members(tf, dest_dir)
 
     if patches:
         poke(dest_dir, patches)
@@ -206,16 +325,24 @@ def extract_archive(
     """Extract an archive into *dest_dir* and return *dest_dir*."""
     fmt = _detect_format(archive_path)
     dest_dir.mkdir(parents=True, exist_ok=True)
+    rebase = None
+    # Tar and zip entries are rebased while extracting; other formats are relocated afterwards
+    if extract_dir and (fmt == "zip" or fmt.startswith("tar:")):
+        _checked_extract_dir(dest_dir, extract_dir)
+        rebase = _ExtractDirRebase(prefix=extract_dir.strip("/") + "/")
     try:
         if fmt == "conda":
             _extract_conda(archive_path, dest_dir)
             if progress_callback:
                 progress_callback(app_name, 1, 1)
+        elif fmt.startswith("tar:"):
+            _extract_tar(archive_path, fmt.split(":")[1], dest_dir, progress_callback, app_name, rebase)
         else:
             with _open_archive(archive_path, fmt) as archive:
-                _extract_all(archive, fmt, dest_dir, progress_callback, app_name)
+                _extract_all(archive, fmt, dest_dir, progress_callback, app_name, rebase)
     except py7zr.exceptions.UnsupportedCompressionMethodError as exc:
         raise UserNotificationException(f"Cannot extract '{archive_path.name}': {exc}. Try installing 7-Zip and extracting manually.") from exc
-    if extract_dir:
+    # No entry under extract_dir: relocation reports it as missing
+    if extract_dir and not (rebase and rebase.matched):
         _relocate_extract_dir(dest_dir, extract_dir)
     return dest_dir
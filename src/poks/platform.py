@@ -4,6 +4,7 @@ from __future__ import annotations
 
 import platform
 import sys
+from functools import lru_cache
 
 _OS_MAP: dict[str, str] = {
     "win32": "windows",
@@ -19,10 +20,13 @@ _ARCH_MAP: dict[str, str] = {
 }
 
 
+@lru_cache(maxsize=1)
 def get_current_platform() -> tuple[str, str]:
     """
     Return the current ``(os, arch)`` using Poks naming conventions.
 
+    The result is cached for the lifetime of the process.
+
     Raises:
         ValueError: If the current OS or architecture is not recognized.
 
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import logging
+import mmap
 from dataclasses import dataclass
 from pathlib import Path
 
@@ -41,25 +42,38 @@ def poke(install_dir: Path, patches: list[PatchEntry]) -> None:
             logger.warning("Unknown file_mode %r for %s, skipping", entry.file_mode, entry.path)
 
 
-def _poke_text(target: Path, placeholder: str, new_prefix: str) -> None:
-    content = target.read_text(encoding="utf-8", errors="surrogateescape")
-    updated = content.replace(placeholder, new_prefix)
+def _prefix_pairs(placeholder: str, new_prefix: str) -> list[tuple[bytes, bytes]]:
+    """Return ``(placeholder, replacement)`` byte pairs, adding the forward-slash form for Windows placeholders."""
+    pairs = [(placeholder.encode("utf-8"), new_prefix.encode("utf-8"))]
     if "\\" in placeholder:
-        updated = updated.replace(placeholder.replace("\\", "/"), new_prefix.replace("\\", "/"))
-    target.write_text(updated, encoding="utf-8", errors="surrogateescape")
+        pairs.append((placeholder.replace("\\", "/").encode("utf-8"), new_prefix.replace("\\", "/").encode("utf-8")))
+    return pairs
 
 
-def _poke_binary(target: Path, placeholder: str, new_prefix: str) -> None:
-    placeholder_bytes = placeholder.encode("utf-8")
-    new_bytes = new_prefix.encode("utf-8")
-    if len(new_bytes) > len(placeholder_bytes):
-        raise ValueError(f"Cannot poke '{target.name}': install path ({len(new_bytes)} bytes) exceeds placeholder ({len(placeholder_bytes)} bytes)")
-    padded = new_bytes + b"\x00" * (len(placeholder_bytes) - len(new_bytes))
+def _poke_text(target: Path, placeholder: str, new_prefix: str) -> None:
     data = target.read_bytes()
-    updated = data.replace(placeholder_bytes, padded)
-    if "\\" in placeholder:
-        fwd_placeholder = placeholder.replace("\\", "/").encode("utf-8")
-        fwd_new = new_prefix.replace("\\", "/").encode("utf-8")
-        fwd_padded = fwd_new + b"\x00" * (len(fwd_placeholder) - len(fwd_new))
-        updated = updated.replace(fwd_placeholder, fwd_padded)
-    target.write_bytes(updated)
+    pairs = [(old, new) for old, new in _prefix_pairs(placeholder, new_prefix) if old in data]
+    if not pairs:
+        return
+    for old, new in pairs:
+        data = data.replace(old, new)
+    target.write_bytes(data)
+
+
+def _poke_binary(target: Path, placeholder: str, new_prefix: str) -> None:
+    pairs = _prefix_pairs(placeholder, new_prefix)
+    placeholder_len, new_len = len(pairs[0][0]), len(pairs[0][1])
+    if new_len > placeholder_len:
+        raise ValueError(f"Cannot poke '{target.name}': install path ({new_len} bytes) exceeds placeholder ({placeholder_len} bytes)")
+    if target.stat().st_size == 0:
+        return
+    with target.open("r+b") as fh, mmap.mmap(fh.fileno(), 0) as mm:
+        for old, new in pairs:
+            _splice_all(mm, old, new + b"\x00" * (len(old) - len(new)))
+
+
+def _splice_all(mm: mmap.mmap, old: bytes, new: bytes) -> None:
+    pos = mm.find(old)
+    while pos != -1:
+        mm[pos : pos + len(old)] = new
+        pos = mm.find(old, pos + len(new))
@@ -1,7 +1,10 @@
 import json
+import os
 import shutil
 from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
+from typing import Any
 
 from git import Repo
 from git.exc import InvalidGitRepositoryError, NoSuchPathError
@@ -9,7 +12,6 @@ from py_app_dev.core.exceptions import UserNotificationException
 from py_app_dev.core.logging import logger
 
 from poks.bucket import (
-    find_manifest,
     get_bucket_id,
     is_bucket_url,
     load_registry,
@@ -26,6 +28,53 @@ from poks.platform import get_current_platform
 from poks.progress import ProgressCallback, default_progress
 from poks.resolver import resolve_archive, resolve_download_url
 
+_MAX_WORKERS = 8
+
+
+@dataclass
+class _InstallTask:
+    """An app that needs installing, with its bucket manifest already located."""
+
+    app: PoksApp
+    manifest_path: Path
+    bucket: PoksBucket | None
+
+
+def _list_subdirs(path: Path) -> list[Path]:
+    """Return the subdirectories of *path* (empty if it does not exist)."""
+    try:
+        with os.scandir(path) as entries:
+            return [Path(entry.path) for entry in entries if entry.is_dir()]
+    except FileNotFoundError:
+        return []
+
+
+def _stored_versions(manifest_path: Path) -> dict[str, dict[str, Any]]:
+    """Return the raw version entries of a stored ``.manifest.json`` keyed by version (first entry wins)."""
+    raw_versions = json.loads(manifest_path.read_text())["versions"]
+    return {entry["version"]: entry for entry in reversed(raw_versions) if "version" in entry}
+
+
+def _index_buckets(buckets: list[PoksBucket]) -> dict[str, PoksBucket]:
+    """Index buckets by both name and ID; the first bucket claiming a key wins."""
+    index: dict[str, PoksBucket] = {}
+    for bucket in buckets:
+        for key in (bucket.name, bucket.id):
+            if key:
+                index.setdefault(key, bucket)
+    return index
+
+
+def _supported_apps(apps: list[PoksApp], current_os: str, current_arch: str) -> list[PoksApp]:
+    """Return the apps that support the current platform, logging the ones that are skipped."""
+    supported = []
+    for app in apps:
+        if app.is_supported(current_os, current_arch):
+            supported.append(app)
+        else:
+            logger.info(f"Skipping {app.name}: not supported on {current_os}/{current_arch}")
+    return supported
+
 
 class Poks:
     """Cross-platform package manager for developer tools."""
@@ -57,6 +106,7 @@ class Poks:
         self.apps_dir = root_dir / "apps"
         self.buckets_dir = root_dir / "buckets"
         self.cache_dir = root_dir / "cache"
+        self.registry_path = self.buckets_dir / "buckets.json"
         self.progress_callback = progress_callback
         self.extract_callback = extract_callback
         self.use_cache = use_cache
@@ -77,8 +127,7 @@ class Poks:
             ValueError: If bucket is not found or version is missing.
 
         """
-        registry_path = self.buckets_dir / "buckets.json"
-        registry = load_registry(registry_path)
+        registry = load_registry(self.registry_path)
 
         bucket_obj = self._resolve_bucket(bucket, app_name, registry)
         bucket_ref = bucket_obj.id or bucket_obj.name or "unknown"
@@ -86,7 +135,7 @@ class Poks:
         # If we created a new bucket entry (e.g. from URL), save the registry
         if bucket and is_bucket_url(bucket) and not registry.get_by_id(bucket_obj.id or ""):
             registry.add_or_update(bucket_obj)
-            save_registry(registry, registry_path)
+            save_registry(registry, self.registry_path)
 
         config = PoksConfig(
             buckets=[bucket_obj],
@@ -116,7 +165,7 @@ class Poks:
         manifest = PoksManifest.from_json_file(manifest_path)
         current_os, current_arch = get_current_platform()
 
-        app_version = next((v for v in manifest.versions if v.version == version), None)
+        app_version = manifest.get_version(version)
         if not app_version:
             raise ValueError(f"Version {version} not found for app {app_name} in manifest")
         if app_version.yanked:
@@ -126,6 +175,10 @@ class Poks:
         except ValueError as e:
             raise UserNotificationException(f"Cannot install '{app_name}': {e}") from e
 
+        installed = self._load_already_installed(app_name, version, current_os, current_arch)
+        if installed:
+            return installed
+
         install_dir = self.apps_dir / app_name / version
         if not install_dir.exists():
             effective = app_version.resolve_for_archive(archive)
@@ -139,8 +192,7 @@ class Poks:
                 use_cache=self.use_cache,
             )
             extract_archive(download_result.path, install_dir, extract_dir=effective.extract_dir, progress_callback=self.extract_callback, app_name=app_name)
-            (install_dir / ".manifest.json").write_text(manifest.to_json_string())
-            self._create_receipt(install_dir, "", [])
+            self._write_metadata(install_dir, manifest, self._build_receipt(None))
             downloaded = download_result.downloaded
             extracted = True
         else:
@@ -221,34 +273,72 @@ class Poks:
         self._ensure_buckets_registered(config.buckets)
 
         current_os, current_arch = get_current_platform()
+        apps = _supported_apps(config.apps, current_os, current_arch)
         bucket_paths = sync_all_buckets(config.buckets, self.buckets_dir)
 
-        installed_apps = self._install_apps_parallel(config.apps, bucket_paths, config.buckets, current_os, current_arch)
+        installed_apps = self._install_apps_parallel(apps, bucket_paths, _index_buckets(config.buckets), current_os, current_arch)
         return InstallResult(apps=installed_apps)
 
     def _install_apps_parallel(
         self,
         apps: list[PoksApp],
         bucket_paths: dict[str, Path],
-        buckets_list: list[PoksBucket],
+        bucket_index: dict[str, PoksBucket],
         current_os: str,
         current_arch: str,
     ) -> list[InstalledApp]:
-        if len(apps) <= 1:
-            results = [self._install_single_app(app, bucket_paths, buckets_list, current_os, current_arch) for app in apps]
-            return [r for r in results if r is not None]
-
-        # Map future -> index to preserve config ordering
-        with ThreadPoolExecutor(max_workers=len(apps)) as executor:
-            futures = {executor.submit(self._install_single_app, app, bucket_paths, buckets_list, current_os, current_arch): idx for idx, app in enumerate(apps)}
-            ordered: dict[int, InstalledApp | None] = {}
+        # Keyed by config index to preserve config ordering
+        ordered: dict[int, InstalledApp] = {}
+        pending: dict[int, _InstallTask] = {}
+        for idx, app in enumerate(apps):
+            bucket_path = bucket_paths.get(app.bucket)
+            if not bucket_path:
+                raise ValueError(f"Bucket '{app.bucket}' not found. Available buckets: {', '.join(bucket_paths)}")
+            manifest_path = bucket_path / f"{app.name}.json"
+            if not manifest_path.is_file():
+                raise FileNotFoundError(f"Manifest '{app.name}.json' not found in bucket at {bucket_path}")
+            installed = self._load_already_installed(app.name, app.version, current_os, current_arch)
+            if installed:
+                ordered[idx] = installed
+                continue
+            pending[idx] = _InstallTask(app=app, manifest_path=manifest_path, bucket=bucket_index.get(app.bucket))
+
+        if len(pending) <= 1:
+            ordered.update({idx: self._install_single_app(task, current_os, current_arch) for idx, task in pending.items()})
+        else:
+            ordered.update(self._install_pending_in_pool(pending, current_os, current_arch))
+
+        return [ordered[idx] for idx in sorted(ordered)]
+
+    def _install_pending_in_pool(self, pending: dict[int, _InstallTask], current_os: str, current_arch: str) -> dict[int, InstalledApp]:
+        """Install apps concurrently; the first failure cancels installs that have not started yet."""
+        results: dict[int, InstalledApp] = {}
+        executor = ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(pending)))
+        try:
+            futures = {executor.submit(self._install_single_app, task, current_os, current_arch): idx for idx, task in pending.items()}
             for future in as_completed(futures):
-                ordered[futures[future]] = future.result()
+                results[futures[future]] = future.result()
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+        return results
 
-        return [app for idx in sorted(ordered) if (app := ordered[idx]) is not None]
+    def _load_already_installed(self, app_name: str, version: str, current_os: str, current_arch: str) -> InstalledApp | None:
+        """Build the result for an app installed by a previous run from its stored manifest."""
+        install_dir = self.apps_dir / app_name / version
+        manifest_path = install_dir / ".manifest.json"
+        if not install_dir.exists() or not manifest_path.exists():
+            return None
+        try:
+            effective = self._resolve_installed_version(manifest_path, version, current_os, current_arch)
+        except (ValueError, LookupError) as e:
+            logger.warning(f"Ignoring stored manifest for {app_name}@{version}: {e}")
+            return None
+        if not effective:
+            return None
+        return self._build_installed_app(app_name, version, install_dir, effective)
 
     def _ensure_buckets_registered(self, buckets: list[PoksBucket]) -> None:
-        registry = load_registry(self.buckets_dir / "buckets.json")
+        registry = load_registry(self.registry_path)
         registry_updated = False
         for bucket in buckets:
             if bucket.url:
@@ -265,27 +355,13 @@ class Poks:
                     registry_updated = True
 
         if registry_updated:
-            save_registry(registry, self.buckets_dir / "buckets.json")
-
-    def _install_single_app(
-        self,
-        app: PoksApp,
-        bucket_paths: dict[str, Path],
-        buckets_list: list[PoksBucket],
-        current_os: str,
-        current_arch: str,
-    ) -> InstalledApp | None:
-        if not app.is_supported(current_os, current_arch):
-            logger.info(f"Skipping {app.name}: not supported on {current_os}/{current_arch}")
-            return None
+            save_registry(registry, self.registry_path)
 
-        bucket_path = bucket_paths.get(app.bucket)
-        if not bucket_path:
-            raise ValueError(f"Bucket '{app.bucket}' not found. Available buckets: {', '.join(bucket_paths)}")
-        manifest_path = find_manifest(app.name, bucket_path)
-        manifest = PoksManifest.from_json_file(manifest_path)
+    def _install_single_app(self, task: _InstallTask, current_os: str, current_arch: str) -> InstalledApp:
+        app = task.app
+        manifest = PoksManifest.from_json_file(task.manifest_path)
 
-        app_version = next((v for v in manifest.versions if v.version == app.version), None)
+        app_version = manifest.get_version(app.version)
 
         if not app_version:
             raise ValueError(f"Version {app.version} not found for app {app.name} in manifest")
@@ -311,9 +387,7 @@ class Poks:
             )
             extract_archive(download_result.path, install_dir, extract_dir=effective.extract_dir, progress_callback=self.extract_callback, app_name=app.name)
 
-            # Persist manifest and receipt for future reference
-            (install_dir / ".manifest.json").write_text(manifest.to_json_string())
-            self._create_receipt(install_dir, app.bucket, buckets_list)
+            self._write_metadata(install_dir, manifest, self._build_receipt(task.bucket))
             downloaded = download_result.downloaded
             extracted = True
         else:
@@ -323,16 +397,21 @@ class Poks:
 
         return self._build_installed_app(app.name, app.version, install_dir, effective, downloaded=downloaded, extracted=extracted)
 
-    def _create_receipt(self, install_dir: Path, bucket_ref: str, buckets_list: list[PoksBucket]) -> None:
-        receipt: dict[str, str | None] = {"bucket_id": None, "bucket_name": None, "bucket_url": None}
-
-        matched_bucket = next((b for b in buckets_list if b.name == bucket_ref or b.id == bucket_ref), None)
-        if matched_bucket:
-            receipt["bucket_id"] = matched_bucket.id
-            receipt["bucket_name"] = matched_bucket.name
-            receipt["bucket_url"] = matched_bucket.url
+    @staticmethod
+    def _build_receipt(bucket: PoksBucket | None) -> dict[str, str | None]:
+        if not bucket:
+            return {"bucket_id": None, "bucket_name": None, "bucket_url": None}
+        return {"bucket_id": bucket.id, "bucket_name": bucket.name, "bucket_url": bucket.url}
 
-        (install_dir / ".receipt.json").write_text(json.dumps(receipt, indent=2))
+    @staticmethod
+    def _write_metadata(install_dir: Path, manifest: PoksManifest, receipt: dict[str, str | None]) -> None:
+        """Persist the manifest and receipt sidecars next to the extracted app."""
+        sidecars = {
+            ".manifest.json": manifest.to_json_string(),
+            ".receipt.json": json.dumps(receipt, separators=(",", ":")),
+        }
+        for name, content in sidecars.items():
+            (install_dir / name).write_bytes(content.encode())
 
     def list_installed(self) -> InstallResult:
         """
@@ -342,23 +421,14 @@ class Poks:
             Install result with per-app details and aggregated environment helpers.
 
         """
-        installed_apps: list[InstalledApp] = []
-        if not self.apps_dir.exists():
-            return InstallResult(apps=[])
-
-        for app_dir in self.apps_dir.iterdir():
-            if not app_dir.is_dir():
-                continue
-
-            for version_dir in app_dir.iterdir():
-                if not version_dir.is_dir():
-                    continue
-
-                installed = self._load_installed_app(app_dir.name, version_dir)
-                if installed:
-                    installed_apps.append(installed)
+        version_dirs = [version_dir for app_dir in _list_subdirs(self.apps_dir) for version_dir in _list_subdirs(app_dir)]
+        if len(version_dirs) <= 1:
+            loaded = [self._load_installed_app(version_dir.parent.name, version_dir) for version_dir in version_dirs]
+        else:
+            with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(version_dirs))) as executor:
+                loaded = list(executor.map(lambda version_dir: self._load_installed_app(version_dir.parent.name, version_dir), version_dirs))
 
-        return InstallResult(apps=installed_apps)
+        return InstallResult(apps=[installed for installed in loaded if installed])
 
     def _load_installed_app(self, app_name: str, version_dir: Path) -> InstalledApp | None:
         version = version_dir.name
@@ -368,26 +438,32 @@ class Poks:
             return InstalledApp(name=app_name, version=version, install_dir=version_dir, bin_dirs=[], env={})
 
         try:
-            manifest = PoksManifest.from_json_file(manifest_path)
-            app_version = next((v for v in manifest.versions if v.version == version), None)
+            current_os, current_arch = get_current_platform()
+            effective = self._resolve_installed_version(manifest_path, version, current_os, current_arch)
 
-            if not app_version:
+            if not effective:
                 logger.warning(f"Version {version} not found in stored manifest for {app_name}")
                 return InstalledApp(name=app_name, version=version, install_dir=version_dir, bin_dirs=[], env={})
 
-            current_os, current_arch = get_current_platform()
-            try:
-                archive = resolve_archive(app_version, current_os, current_arch)
-                effective = app_version.resolve_for_archive(archive)
-            except ValueError:
-                effective = app_version
-
             return self._build_installed_app(app_name, version, version_dir, effective)
 
         except Exception as e:
             logger.warning(f"Failed to load manifest for {app_name}@{version}: {e}")
             return InstalledApp(name=app_name, version=version, install_dir=version_dir, bin_dirs=[], env={})
 
+    @staticmethod
+    def _resolve_installed_version(manifest_path: Path, version: str, current_os: str, current_arch: str) -> PoksAppVersion | None:
+        """Return the stored version spec with archive overrides for the platform applied, or None if the version is missing."""
+        raw_version = _stored_versions(manifest_path).get(version)
+        if not raw_version:
+            return None
+        app_version = PoksAppVersion.from_dict(raw_version)
+        try:
+            archive = resolve_archive(app_version, current_os, current_arch)
+        except ValueError:
+            return app_version
+        return app_version.resolve_for_archive(archive)
+
     @staticmethod
     def _build_installed_app(
         name: str,
@@ -398,11 +474,8 @@ class Poks:
         extracted: bool = False,
     ) -> InstalledApp:
         bin_dirs = [install_dir / entry for entry in app_version.bin_dirs] if app_version.bin_dirs else []
-        env: dict[str, str] = {}
-        if app_version.env:
-            dir_str = str(install_dir)
-            for k, v in app_version.env.items():
-                env[k] = str(Path(v.replace("${dir}", dir_str)))
+        dir_str = str(install_dir)
+        env = {key: os.path.normpath(value.replace("${dir}", dir_str)) for key, value in app_version.env.items()} if app_version.env else {}
         return InstalledApp(
             name=name,
             version=version,
@@ -426,12 +499,7 @@ class Poks:
         """
         if all_apps:
             logger.info("Uninstalling all apps")
-            if not self.apps_dir.exists():
-                return
-            for item in self.apps_dir.iterdir():
-                if item.is_dir():
-                    shutil.rmtree(item)
-                    logger.info(f"Removed {item.name}")
+            self._remove_dirs_parallel(_list_subdirs(self.apps_dir))
             if wipe and self.cache_dir.exists():
                 shutil.rmtree(self.cache_dir)
                 logger.info("Removed download cache")
@@ -451,9 +519,7 @@ class Poks:
                 logger.info(f"Uninstalling {app_name}@{version}")
                 shutil.rmtree(version_dir)
                 logger.info(f"Removed {app_name}@{version}")
-                if app_dir.exists() and not any(app_dir.iterdir()):
-                    app_dir.rmdir()
-                    logger.info(f"Removed empty directory {app_name}")
+                self._remove_if_empty(app_dir)
         else:
             if not app_dir.exists():
                 logger.warning(f"App {app_name} is not installed")
@@ -466,6 +532,22 @@ class Poks:
             shutil.rmtree(self.cache_dir)
             logger.info("Removed download cache")
 
+    @staticmethod
+    def _remove_if_empty(app_dir: Path) -> None:
+        try:
+            app_dir.rmdir()
+        except OSError:
+            return
+        logger.info(f"Removed empty directory {app_dir.name}")
+
+    @staticmethod
+    def _remove_dirs_parallel(dirs: list[Path]) -> None:
+        if not dirs:
+            return
+        with ThreadPoolExecutor(max_workers=min(_MAX_WORKERS, len(dirs))) as executor:
+            for path, _ in zip(dirs, executor.map(shutil.rmtree, dirs), strict=True):
+                logger.info(f"Removed {path.name}")
+
     def search(self, query: str, update: bool = True) -> list[str]:
         """
         Search for apps in all local buckets.
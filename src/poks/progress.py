@@ -1,7 +1,9 @@
 """Download and extraction progress reporting for Poks."""
 
 import threading
+import time
 from collections.abc import Callable
+from dataclasses import dataclass
 
 from rich.progress import (
     BarColumn,
@@ -16,6 +18,17 @@ from rich.progress import (
 ProgressCallback = Callable[[str, int, int | None], None]
 # Signature: (app_name, current, total_or_none)
 
+_RENDER_INTERVAL_SECONDS = 0.05
+
+
+@dataclass
+class _TaskState:
+    """Rich task handle plus what was last pushed to it, used to coalesce updates."""
+
+    task_id: TaskID
+    total: int | None
+    last_render: float = 0.0
+
 
 class RichProgressHandler:
     """Rich-based progress display with separate download and extraction bars."""
@@ -23,8 +36,8 @@ class RichProgressHandler:
     def __init__(self) -> None:
         self._download_progress: Progress | None = None
         self._extract_progress: Progress | None = None
-        self._download_tasks: dict[str, TaskID] = {}
-        self._extract_tasks: dict[str, TaskID] = {}
+        self._download_tasks: dict[str, _TaskState] = {}
+        self._extract_tasks: dict[str, _TaskState] = {}
         self._lock = threading.Lock()
 
     def _ensure_download_progress(self) -> Progress:
@@ -50,49 +63,46 @@ class RichProgressHandler:
             self._extract_progress.start()
         return self._extract_progress
 
-    def _update_task(
+    def _update_task_locked(
         self,
         progress: Progress,
-        tasks: dict[str, TaskID],
+        tasks: dict[str, _TaskState],
         app_name: str,
         current: int,
         total: int | None,
-    ) -> None:
-        with self._lock:
-            if app_name not in tasks:
-                tasks[app_name] = progress.add_task(app_name, total=total or 0)
-            task_id = tasks[app_name]
-        if total and progress.tasks[task_id].total != total:
-            progress.update(task_id, total=total)
-        progress.update(task_id, completed=current)
-
-    def _finish_task(self, progress: Progress | None, tasks: dict[str, TaskID], app_name: str) -> None:
-        with self._lock:
-            tasks.pop(app_name, None)
-            if not tasks and progress is not None:
-                progress.stop()
+    ) -> bool:
+        """Push an update to the app's task; return True if this finished the last task and stopped the bar. Caller holds the lock."""
+        state = tasks.get(app_name)
+        if state is None:
+            state = tasks[app_name] = _TaskState(task_id=progress.add_task(app_name, total=total or 0), total=total)
+        if total and state.total != total:
+            state.total = total
+            progress.update(state.task_id, total=total)
+        finished = bool(total and current >= total)
+        now = time.monotonic()
+        # Always render the final update; intermediate ones are throttled
+        if finished or now - state.last_render >= _RENDER_INTERVAL_SECONDS:
+            state.last_render = now
+            progress.update(state.task_id, completed=current)
+        if not finished:
+            return False
+        tasks.pop(app_name, None)
+        if tasks:
+            return False
+        progress.stop()
+        return True
 
     def on_download(self, app_name: str, downloaded: int, total: int | None) -> None:
         """Report download progress for an app."""
         with self._lock:
-            progress = self._ensure_download_progress()
-        self._update_task(progress, self._download_tasks, app_name, downloaded, total)
-        if total and downloaded >= total:
-            self._finish_task(self._download_progress, self._download_tasks, app_name)
-            with self._lock:
-                if not self._download_tasks:
-                    self._download_progress = None
+            if self._update_task_locked(self._ensure_download_progress(), self._download_tasks, app_name, downloaded, total):
+                self._download_progress = None
 
     def on_extract(self, app_name: str, extracted: int, total: int | None) -> None:
         """Report extraction progress for an app."""
         with self._lock:
-            progress = self._ensure_extract_progress()
-        self._update_task(progress, self._extract_tasks, app_name, extracted, total)
-        if total and extracted >= total:
-            self._finish_task(self._extract_progress, self._extract_tasks, app_name)
-            with self._lock:
-                if not self._extract_tasks:
-                    self._extract_progress = None
+            if self._update_task_locked(self._ensure_extract_progress(), self._extract_tasks, app_name, extracted, total):
+                self._extract_progress = None
 
 
 default_progress = RichProgressHandler()
@@ -4,6 +4,8 @@ import re
 
 from poks.domain import PoksAppVersion, PoksArchive
 
+_VARIABLE_PATTERN = re.compile(r"\$\{(\w+)}")
+
 
 def expand_variables(template: str, variables: dict[str, str]) -> str:
     """
@@ -11,12 +13,14 @@ def expand_variables(template: str, variables: dict[str, str]) -> str:
 
     Unknown keys are left as-is.
     """
+    if "${" not in template:
+        return template
 
     def _replace(match: re.Match[str]) -> str:
         key = match.group(1)
         return variables.get(key, match.group(0))
 
-    return re.sub(r"\$\{(\w+)}", _replace, template)
+    return _VARIABLE_PATTERN.sub(_replace, template)
 
 
 def resolve_archive(version: PoksAppVersion, target_os: str, target_arch: str) -> PoksArchive:
@@ -48,6 +52,8 @@ def resolve_download_url(version: PoksAppVersion, archive: PoksArchive) -> str:
     template = archive.url or version.url
     if not template:
         raise ValueError("No URL: the archive has no url and the version has no root url template.")
+    if "${" not in template:
+        return template
     variables: dict[str, str] = {
         "version": version.version,
         "os": archive.os,
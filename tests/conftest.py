@@ -2,14 +2,18 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass, field
+import threading
+from collections.abc import Callable, Iterator
+from dataclasses import dataclass
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 
 import pytest
 
 from poks.domain import PoksApp, PoksBucket, PoksConfig, PoksManifest
 from poks.poks import Poks
-from tests.helpers import create_archive, update_test_bucket_repo
+from tests.helpers import create_archive, make_bucket_builder, update_test_bucket_repo
 
 
 @dataclass
@@ -23,16 +27,22 @@ class PoksEnv:
     archives_dir: Path
     bucket_url: str
     poks: Poks
-    _manifests: dict[str, str] = field(default_factory=dict, repr=False)
 
     def add_manifest(self, name: str, manifest: PoksManifest) -> None:
-        """Commit a manifest JSON file into the test bucket repository."""
-        filename = f"{name}.json"
-        self._manifests[filename] = manifest.to_json_string()
-        # Update the persistent repo with all accumulated manifests
-        bucket_base = self.root_dir / "bucket-src"
-        bucket_base.mkdir(parents=True, exist_ok=True)
-        self.bucket_url = update_test_bucket_repo(bucket_base, self._manifests)
+        """Commit a manifest JSON file on top of the test bucket repository."""
+        self.add_manifests({name: manifest})
+
+    def add_manifests(self, manifests: dict[str, PoksManifest]) -> None:
+        """Commit several manifest JSON files to the test bucket repository in a single commit."""
+        files = {f"{name}.json": manifest.to_json_string() for name, manifest in manifests.items()}
+        self.bucket_url = update_test_bucket_repo(self.root_dir / "bucket-src", files)
+
+    def make_app_tree(self, files: dict[str, str]) -> None:
+        """Create files under ``apps_dir`` (keys are relative paths), making each parent directory once."""
+        for parent in sorted({(self.apps_dir / name).parent for name in files}):
+            parent.mkdir(parents=True, exist_ok=True)
+        for name, content in files.items():
+            (self.apps_dir / name).write_text(content)
 
     def make_archive(
         self,
@@ -54,8 +64,14 @@ class PoksEnv:
         return config_path
 
 
+@pytest.fixture(scope="session")
+def empty_bucket_builder(tmp_path_factory: pytest.TempPathFactory) -> Callable[[Path], str]:
+    """Copy a pre-built empty bucket repository into a directory and return its URL."""
+    return make_bucket_builder(tmp_path_factory.mktemp("empty-bucket"), {})
+
+
 @pytest.fixture
-def poks_env(tmp_path: Path) -> PoksEnv:
+def poks_env(tmp_path: Path, empty_bucket_builder: Callable[[Path], str]) -> PoksEnv:
     """Provide a fully wired Poks environment in a temporary directory."""
     root_dir = tmp_path / ".poks"
     root_dir.mkdir()
@@ -68,10 +84,7 @@ def poks_env(tmp_path: Path) -> PoksEnv:
     archives_dir = tmp_path / "archives"
     archives_dir.mkdir()
 
-    # Create an initial empty bucket repo
-    bucket_base = root_dir / "bucket-src"
-    bucket_base.mkdir()
-    bucket_url = update_test_bucket_repo(bucket_base, {})
+    bucket_url = empty_bucket_builder(root_dir / "bucket-src")
 
     poks = Poks(root_dir=root_dir)
 
@@ -84,3 +97,16 @@ def poks_env(tmp_path: Path) -> PoksEnv:
         bucket_url=bucket_url,
         poks=poks,
     )
+
+
+@pytest.fixture(scope="session")
+def archive_mirror(pytestconfig: pytest.Config, tmp_path_factory: pytest.TempPathFactory) -> Iterator[tuple[Path, str]]:
+    """Serve a persistent archive directory over localhost HTTP and return ``(directory, base_url)``."""
+    cache = getattr(pytestconfig, "cache", None)
+    mirror_dir = cache.mkdir("poks-archive-mirror") if cache else tmp_path_factory.mktemp("archive-mirror")
+    server = ThreadingHTTPServer(("127.0.0.1", 0), partial(SimpleHTTPRequestHandler, directory=str(mirror_dir)))
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield mirror_dir, f"http://127.0.0.1:{server.server_address[1]}"
+    server.shutdown()
+    server.server_close()
@@ -2,18 +2,33 @@
 
 from __future__ import annotations
 
+import gzip
 import hashlib
 import json
+import os
+import shutil
 import tarfile
+import tempfile
 import zipfile
 from collections.abc import Callable
+from functools import lru_cache
 from io import BytesIO
 from pathlib import Path
+from typing import BinaryIO
 
 import zstandard
 from git import Repo
+from git.index import IndexFile
+from git.index.typ import BaseIndexEntry
+from git.objects import Blob
 
-from poks.domain import InstalledApp, InstallResult
+from poks.domain import InstalledApp, InstallResult, PoksManifest
+from poks.downloader import get_cached_or_download
+from poks.platform import get_current_platform
+from poks.resolver import resolve_archive, resolve_download_url
+
+# Archive builders run on the test thread only, so one compression context is reused
+_ZSTD_COMPRESSOR = zstandard.ZstdCompressor()
 
 
 def assert_install_result(result: InstallResult, expected_count: int) -> list[InstalledApp]:
@@ -56,105 +71,171 @@ def create_archive(
         Tuple of (archive_path, sha256_hex).
 
     """
-    if fmt == "conda":
-        archive_path = _create_conda(base_dir, files, top_dir, patches=conda_patches)
-    else:
-        creators: dict[str, Callable[..., Path]] = {"tar.gz": _create_tar_gz, "zip": _create_zip}
-        creator = creators.get(fmt)
-        if creator is None:
-            raise ValueError(f"Unsupported test archive format: {fmt!r}. Use 'tar.gz', 'zip', or 'conda'.")
-        archive_path = creator(base_dir, files, top_dir)
-    sha256 = hashlib.sha256(archive_path.read_bytes()).hexdigest()
+    suffixes = {"tar.gz": ".tar.gz", "zip": ".zip", "conda": ".conda"}
+    if fmt not in suffixes:
+        raise ValueError(f"Unsupported test archive format: {fmt!r}. Use 'tar.gz', 'zip', or 'conda'.")
+    patches_key = tuple(tuple(patch.items()) for patch in conda_patches) if conda_patches else None
+    data, sha256 = _build_archive_bytes(tuple(files.items()), fmt, top_dir, patches_key)
+    archive_path = base_dir / f"archive{suffixes[fmt]}"
+    archive_path.write_bytes(data)
     return archive_path, sha256
 
 
 def update_test_bucket_repo(repo_dir: Path, manifests: dict[str, str]) -> str:
     """
-    Update (or create) a non-bare Git repo with manifest JSON files.
+    Update (or create) a bare Git repo with manifest JSON files.
+
+    Blobs are written straight into the object database and committed from an
+    in-memory index, so no working tree is ever materialized. Each call adds one
+    commit on top of the previous one; files not listed keep their content.
 
     Args:
-        repo_dir: Directory for the bucket repository.
+        repo_dir: Directory for the bare bucket repository.
         manifests: Mapping of filename (e.g. ``"my-tool.json"``) → JSON string content.
 
     Returns:
         A ``file://`` URL pointing to the repository.
 
     """
-    if not (repo_dir / ".git").exists():
-        Repo.init(repo_dir)
-
-    for name, content in manifests.items():
-        (repo_dir / name).write_text(content)
+    repo = Repo(repo_dir) if (repo_dir / "HEAD").exists() else Repo.init(repo_dir, bare=True)
 
     # Ensure there is always something to commit
-    if not manifests:
-        (repo_dir / ".gitkeep").write_text("")
-
-    repo = Repo(repo_dir)
-    repo.index.add([str(repo_dir / name) for name in (manifests or {".gitkeep": ""})])
-    repo.index.commit("Update manifests")
+    files = manifests or {".gitkeep": ""}
+    index = IndexFile(repo)
+    index.add([BaseIndexEntry((Blob.file_mode, _store_blob(repo, content.encode()), 0, name)) for name, content in files.items()])
+    index.commit("Update manifests")
 
     return repo_dir.as_uri()
 
 
+def write_conda_package(out: Path | BinaryIO, pkg_files: dict[str, bytes], info_files: dict[str, bytes]) -> None:
+    """Write a .conda archive (zip with ``pkg-*.tar.zst`` and ``info-*.tar.zst`` inside) to a path or binary stream."""
+    pkg_name = "test-pkg-1.0-h0_0"
+    # The .conda format stores its inner tarballs uncompressed in the outer zip
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
+        zf.writestr("metadata.json", json.dumps({"conda_pkg_format_version": 2}))
+        zf.writestr(f"pkg-{pkg_name}.tar.zst", _make_tar_zst(pkg_files))
+        zf.writestr(f"info-{pkg_name}.tar.zst", _make_tar_zst(info_files))
+
+
+def make_bucket_builder(template_dir: Path, manifests: dict[str, str]) -> Callable[[Path], str]:
+    """
+    Build a bucket repository with *manifests* once and return a function that copies it into a directory.
+
+    The returned builder skips ``git init`` and blob hashing entirely; it
+    hardlinks the pre-built repository and returns its ``file://`` URL, so
+    session-scoped fixtures can hand every test a fresh bucket of the same shape.
+    Sharing inodes is safe because git never rewrites a file in place: objects
+    are immutable and refs are replaced through a lock file and a rename.
+    """
+    update_test_bucket_repo(template_dir, manifests)
+
+    def build(repo_dir: Path) -> str:
+        shutil.copytree(template_dir, repo_dir, dirs_exist_ok=True, copy_function=os.link)
+        return repo_dir.as_uri()
+
+    return build
+
+
+def seed_cache_file(cache_path: Path, data: bytes) -> Path:
+    """Write *data* to *cache_path* and return the path."""
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    cache_path.write_bytes(data)
+    return cache_path
+
+
+def read_test_bucket_file(repo_dir: Path, name: str) -> str:
+    """
+    Read a file from the tip of a bucket repository without cloning it.
+
+    GitPython serves blob reads through a long-lived ``git cat-file --batch``
+    process, so repeated reads cost a pipe round-trip instead of a fork/exec.
+    """
+    blob = Repo(repo_dir).head.commit.tree / name
+    return blob.data_stream.read().decode()
+
+
+def mirror_current_platform_archive(manifest: PoksManifest, mirror: tuple[Path, str]) -> None:
+    """Fetch the archive for this platform into the mirror (once) and point the manifest at the mirror."""
+    mirror_dir, base_url = mirror
+    app_version = manifest.versions[0]
+    archive = resolve_archive(app_version, *get_current_platform())
+    mirrored = get_cached_or_download(resolve_download_url(app_version, archive), archive.sha256, mirror_dir)
+    archive.url = f"{base_url}/{mirrored.path.name}"
+
+
+def add_tar_entries(tf: tarfile.TarFile, entries: dict[str, bytes]) -> None:
+    """Append regular-file entries, staging each payload through one reused buffer."""
+    buffer = BytesIO()
+    for name, data in entries.items():
+        buffer.seek(0)
+        buffer.truncate()
+        buffer.write(data)
+        buffer.seek(0)
+        info = tarfile.TarInfo(name=name)
+        info.size = len(data)
+        tf.addfile(info, buffer)
+
+
 # ---------------------------------------------------------------------------
 # Private helpers
 # ---------------------------------------------------------------------------
 
 
-def _create_tar_gz(base_dir: Path, files: dict[str, str], top_dir: str | None) -> Path:
-    archive_path = base_dir / "archive.tar.gz"
-    with tarfile.open(archive_path, "w:gz") as tf:
-        for name, content in files.items():
-            entry_name = f"{top_dir}/{name}" if top_dir else name
-            data = content.encode()
-            info = tarfile.TarInfo(name=entry_name)
-            info.size = len(data)
-            tf.addfile(info, BytesIO(data))
-    return archive_path
+@lru_cache(maxsize=128)
+def _build_archive_bytes(
+    files_key: tuple[tuple[str, str], ...],
+    fmt: str,
+    top_dir: str | None,
+    patches_key: tuple[tuple[tuple[str, str], ...], ...] | None,
+) -> tuple[bytes, str]:
+    """Build an archive in memory and return ``(data, sha256)``; memoized so identical inputs are compressed once per session."""
+    files = dict(files_key)
+    out = BytesIO()
+    if fmt == "conda":
+        _create_conda(out, files, top_dir, patches=[dict(patch) for patch in patches_key] if patches_key else None)
+    elif fmt == "zip":
+        _create_zip(out, files, top_dir)
+    else:
+        _create_tar_gz(out, files, top_dir)
+    data = out.getvalue()
+    return data, hashlib.sha256(data).hexdigest()
+
+
+def _store_blob(repo: Repo, data: bytes) -> bytes:
+    with tempfile.TemporaryFile() as fh:
+        fh.write(data)
+        fh.seek(0)
+        return bytes.fromhex(repo.git.hash_object("-w", "--stdin", istream=fh))
+
+
+def _create_tar_gz(out: BinaryIO, files: dict[str, str], top_dir: str | None) -> None:
+    # tarfile's stream mode only takes compresslevel from Python 3.12, so drive the gzip layer directly
+    with gzip.GzipFile(fileobj=out, mode="wb", compresslevel=1) as compressor, tarfile.open(fileobj=compressor, mode="w|", bufsize=64 * 1024) as tf:
+        add_tar_entries(tf, {(f"{top_dir}/{name}" if top_dir else name): content.encode() for name, content in files.items()})
 
 
-def _create_zip(base_dir: Path, files: dict[str, str], top_dir: str | None) -> Path:
-    archive_path = base_dir / "archive.zip"
-    with zipfile.ZipFile(archive_path, "w") as zf:
+def _create_zip(out: BinaryIO, files: dict[str, str], top_dir: str | None) -> None:
+    with zipfile.ZipFile(out, "w", compression=zipfile.ZIP_STORED) as zf:
         for name, content in files.items():
             entry_name = f"{top_dir}/{name}" if top_dir else name
             zf.writestr(entry_name, content)
-    return archive_path
 
 
 def _make_tar_zst(files: dict[str, bytes]) -> bytes:
-    """Build a tar.zst archive in memory from a dict of name -> bytes."""
-    tar_buf = BytesIO()
-    with tarfile.open(fileobj=tar_buf, mode="w:") as tf:
-        for name, data in files.items():
-            info = tarfile.TarInfo(name=name)
-            info.size = len(data)
-            tf.addfile(info, BytesIO(data))
-    cctx = zstandard.ZstdCompressor()
-    return cctx.compress(tar_buf.getvalue())
+    """Build a tar.zst archive in memory from a dict of name -> bytes, streaming the tar through the compressor."""
+    out = BytesIO()
+    with _ZSTD_COMPRESSOR.stream_writer(out, closefd=False) as compressor, tarfile.open(fileobj=compressor, mode="w|") as tf:
+        add_tar_entries(tf, files)
+    return out.getvalue()
 
 
 def _create_conda(
-    base_dir: Path,
+    out: BinaryIO,
     files: dict[str, str],
     top_dir: str | None,
     patches: list[dict[str, str]] | None = None,
-) -> Path:
-    """Build a .conda archive (zip with pkg-*.tar.zst and info-*.tar.zst inside)."""
-    pkg_name = "test-pkg-1.0-h0_0"
+) -> None:
+    """Build a .conda archive whose info tarball carries the given ``paths.json`` patch entries."""
     pkg_files = {(f"{top_dir}/{name}" if top_dir else name): content.encode() for name, content in files.items()}
-    pkg_tar_zst = _make_tar_zst(pkg_files)
-
-    paths_json: dict[str, list[dict[str, str]]] = {"paths": patches or []}
-    info_files = {"paths.json": json.dumps(paths_json).encode()}
-    info_tar_zst = _make_tar_zst(info_files)
-
-    metadata = json.dumps({"conda_pkg_format_version": 2}).encode()
-
-    archive_path = base_dir / "archive.conda"
-    with zipfile.ZipFile(archive_path, "w") as zf:
-        zf.writestr("metadata.json", metadata)
-        zf.writestr(f"pkg-{pkg_name}.tar.zst", pkg_tar_zst)
-        zf.writestr(f"info-{pkg_name}.tar.zst", info_tar_zst)
-    return archive_path
+    write_conda_package(out, pkg_files, {"paths.json": json.dumps({"paths": patches or []}).encode()})
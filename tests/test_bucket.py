@@ -9,6 +9,7 @@ import pytest
 from poks.bucket import find_manifest, sync_all_buckets, sync_bucket
 from poks.domain import PoksAppVersion, PoksArchive, PoksBucket, PoksManifest
 from tests.conftest import PoksEnv
+from tests.helpers import update_test_bucket_repo
 
 
 def test_sync_bucket_clones_new(poks_env: PoksEnv) -> None:
@@ -83,28 +84,30 @@ def test_find_manifest_missing(tmp_path: Path) -> None:
         find_manifest("nonexistent", bucket_path)
 
 
-def test_sync_all_buckets(poks_env: PoksEnv) -> None:
-    poks_env.add_manifest(
-        "tool-x",
-        PoksManifest(
-            description="Tool X",
-            versions=[
-                PoksAppVersion(
-                    version="1.0.0",
-                    archives=[PoksArchive(os="linux", arch="x86_64", sha256="aaa")],
-                )
-            ],
-        ),
+@pytest.fixture(scope="session")
+def populated_bucket_url(tmp_path_factory: pytest.TempPathFactory) -> str:
+    """Read-only bucket with a single ``tool-x`` manifest, built once per session."""
+    manifest = PoksManifest(
+        description="Tool X",
+        versions=[
+            PoksAppVersion(
+                version="1.0.0",
+                archives=[PoksArchive(os="linux", arch="x86_64", sha256="aaa")],
+            )
+        ],
     )
+    return update_test_bucket_repo(tmp_path_factory.mktemp("populated-bucket"), {"tool-x.json": manifest.to_json_string()})
+
 
+def test_sync_all_buckets(populated_bucket_url: str, tmp_path: Path) -> None:
     buckets = [
-        PoksBucket(name="alpha", url=poks_env.bucket_url),
-        PoksBucket(name="beta", url=poks_env.bucket_url),
+        PoksBucket(name="alpha", url=populated_bucket_url),
+        PoksBucket(name="beta", url=populated_bucket_url),
     ]
 
-    result = sync_all_buckets(buckets, poks_env.buckets_dir)
+    result = sync_all_buckets(buckets, tmp_path)
 
     assert set(result.keys()) == {"alpha", "beta"}
     for name, path in result.items():
-        assert path == poks_env.buckets_dir / name
+        assert path == tmp_path / name
         assert (path / "tool-x.json").exists()
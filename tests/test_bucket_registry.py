@@ -68,3 +68,13 @@ def test_registry_add_or_update() -> None:
     retrieved_renamed = registry.get_by_id(bucket_id)
     assert retrieved_renamed is not None
     assert retrieved_renamed.name == "renamed"
+
+
+def test_registry_save_replaces_atomically(tmp_path: Path) -> None:
+    registry_path = tmp_path / "buckets.json"
+    registry_path.write_text("{corrupted")
+
+    save_registry(PoksBucketRegistry(buckets=[PoksBucket(url="https://example.com/bucket.git", id="abc")]), registry_path)
+
+    assert load_registry(registry_path).buckets[0].id == "abc"
+    assert [p.name for p in tmp_path.iterdir()] == ["buckets.json"]
@@ -1,7 +1,8 @@
 """
 Integration test for .conda archive support using a real conda-forge package.
 
-This test performs a REAL DOWNLOAD of the ripgrep conda package (~20MB).
+The ripgrep conda package (~20MB) is downloaded from conda-forge once and kept in
+the pytest cache; installs are then served from a localhost HTTP mirror.
 """
 
 from __future__ import annotations
@@ -15,19 +16,21 @@ import pytest
 
 from poks.domain import PoksConfig, PoksManifest
 from tests.conftest import PoksEnv
-from tests.helpers import assert_installed_app
+from tests.helpers import assert_installed_app, mirror_current_platform_archive
 
 
+@pytest.mark.slow
 @pytest.mark.skipif(
     not (sys.platform == "linux" or sys.platform == "darwin" or sys.platform == "win32"),
     reason="Only standard platforms supported for this real-download test",
 )
-def test_conda_ripgrep_install(poks_env: PoksEnv) -> None:
+def test_conda_ripgrep_install(poks_env: PoksEnv, archive_mirror: tuple[Path, str]) -> None:
     """Download ripgrep from conda-forge (.conda format), install, and verify ripgrep --version."""
     manifest_path = Path(__file__).parent / "data" / "ripgrep.json"
     manifest = PoksManifest.from_json_file(manifest_path)
     version = manifest.versions[0].version
     app_name = "ripgrep"
+    mirror_current_platform_archive(manifest, archive_mirror)
 
     poks_env.add_manifest(app_name, manifest)
     config_path = poks_env.create_config([{"name": app_name, "version": version}])
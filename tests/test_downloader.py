@@ -3,8 +3,12 @@
 from __future__ import annotations
 
 import hashlib
+import os
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
-from unittest.mock import MagicMock, patch
+from unittest.mock import patch
 
 import pytest
 import requests
@@ -13,24 +17,53 @@ from poks.downloader import (
     DownloadError,
     HashMismatchError,
     _cache_path_for,
+    _download_locks,
     download_file,
     get_cached_or_download,
     verify_sha256,
 )
+from tests.helpers import seed_cache_file
 
 SAMPLE_CONTENT = b"hello poks"
-SAMPLE_SHA256 = hashlib.sha256(SAMPLE_CONTENT).hexdigest()
+SAMPLE_SHA256 = "bbe25456d289cf1fbed0b62baf58d7c30b31eb5a7e6df9af888bff103f44b587"  # sha256(SAMPLE_CONTENT)
 
 
-def _mock_requests_get(content_length: str | None = None) -> MagicMock:
-    """Create a mock requests.get that streams SAMPLE_CONTENT."""
-    mock_response = MagicMock()
-    mock_response.headers = {"Content-Length": content_length} if content_length else {}
-    mock_response.iter_content = lambda chunk_size: iter([SAMPLE_CONTENT])
-    mock_response.raise_for_status = MagicMock()
-    mock_response.__enter__ = lambda s: s
-    mock_response.__exit__ = MagicMock(return_value=False)
-    return MagicMock(return_value=mock_response)
+@dataclass
+class _FakeResponse:
+    """Minimal stand-in for a streamed ``requests.Response``."""
+
+    content: bytes
+    headers: dict[str, str] = field(default_factory=dict)
+
+    def __enter__(self) -> _FakeResponse:
+        return self
+
+    def __exit__(self, *_: object) -> None:
+        return None
+
+    def raise_for_status(self) -> None:
+        return None
+
+    def iter_content(self, chunk_size: int) -> Iterator[bytes]:
+        return iter([self.content])
+
+
+@pytest.fixture
+def cache_dir(tmp_path: Path) -> Path:
+    """Per-test download cache directory, created up front."""
+    path = tmp_path / "cache"
+    path.mkdir()
+    return path
+
+
+def _mock_requests_get(content_length: str | None = None) -> Callable[..., _FakeResponse]:
+    """Create a fake requests.get that streams SAMPLE_CONTENT."""
+    headers = {"Content-Length": content_length} if content_length else {}
+    return lambda *_args, **_kwargs: _FakeResponse(SAMPLE_CONTENT, headers)
+
+
+def test_sample_sha256_matches_content() -> None:
+    assert hashlib.sha256(SAMPLE_CONTENT).hexdigest() == SAMPLE_SHA256
 
 
 # -- download_file -----------------------------------------------------------
@@ -74,15 +107,24 @@ def test_verify_sha256_mismatch(tmp_path: Path) -> None:
         verify_sha256(path, "bad" * 16)
 
 
+def test_file_url_larger_than_scratch_buffer_copied_and_verified(tmp_path: Path) -> None:
+    src = tmp_path / "large.bin"
+    content = bytes(range(256)) * ((1 << 20) // 256 + 1)
+    src.write_bytes(content)
+    dest = tmp_path / "copy.bin"
+
+    download_file(src.as_uri(), dest)
+
+    assert dest.read_bytes() == content
+    verify_sha256(dest, hashlib.sha256(content).hexdigest())
+
+
 # -- get_cached_or_download --------------------------------------------------
 
 
-def test_cached_file_reused(tmp_path: Path) -> None:
+def test_cached_file_reused(cache_dir: Path) -> None:
     url = "https://example.com/archive.tar.gz"
-    cache_dir = tmp_path / "cache"
-    cache_dir.mkdir()
-    cached_file = _cache_path_for(url, cache_dir)
-    cached_file.write_bytes(SAMPLE_CONTENT)
+    cached_file = seed_cache_file(_cache_path_for(url, cache_dir), SAMPLE_CONTENT)
 
     with patch("poks.downloader.requests.get") as mock_dl:
         result = get_cached_or_download(url, SAMPLE_SHA256, cache_dir)
@@ -92,12 +134,23 @@ def test_cached_file_reused(tmp_path: Path) -> None:
     mock_dl.assert_not_called()
 
 
-def test_corrupt_cache_redownloaded(tmp_path: Path) -> None:
+def test_cache_hit_rehashed_after_same_size_rewrite(cache_dir: Path) -> None:
+    url = "https://example.com/rewritten.tar.gz"
+    cached_file = seed_cache_file(_cache_path_for(url, cache_dir), SAMPLE_CONTENT)
+    assert get_cached_or_download(url, SAMPLE_SHA256, cache_dir).downloaded is False
+
+    stat = cached_file.stat()
+    cached_file.write_bytes(bytes(len(SAMPLE_CONTENT)))
+    os.utime(cached_file, ns=(stat.st_atime_ns, stat.st_mtime_ns))
+
+    with patch("poks.downloader.requests.get", _mock_requests_get()):
+        assert get_cached_or_download(url, SAMPLE_SHA256, cache_dir).downloaded is True
+    assert cached_file.read_bytes() == SAMPLE_CONTENT
+
+
+def test_corrupt_cache_redownloaded(cache_dir: Path) -> None:
     url = "https://example.com/archive.tar.gz"
-    cache_dir = tmp_path / "cache"
-    cache_dir.mkdir()
-    cached_file = _cache_path_for(url, cache_dir)
-    cached_file.write_bytes(b"corrupt data")
+    cached_file = seed_cache_file(_cache_path_for(url, cache_dir), b"corrupt data")
 
     with patch("poks.downloader.requests.get", _mock_requests_get()):
         result = get_cached_or_download(url, SAMPLE_SHA256, cache_dir)
@@ -119,12 +172,37 @@ def test_missing_cache_downloads(tmp_path: Path) -> None:
     assert result.path.read_bytes() == SAMPLE_CONTENT
 
 
+@pytest.mark.parametrize("url_kind", ["http", "file"])
+def test_fresh_download_with_wrong_hash_raises(tmp_path: Path, cache_dir: Path, url_kind: str) -> None:
+    src = tmp_path / "archive.tar.gz"
+    src.write_bytes(SAMPLE_CONTENT)
+    url = src.as_uri() if url_kind == "file" else "https://example.com/archive.tar.gz"
+
+    with patch("poks.downloader.requests.get", _mock_requests_get()), pytest.raises(HashMismatchError, match="SHA256 mismatch"):
+        get_cached_or_download(url, "0" * 64, cache_dir)
+
+
+def test_concurrent_requests_for_same_archive_download_once(cache_dir: Path) -> None:
+    url = "https://example.com/shared.tar.gz"
+    calls: list[str] = []
+
+    def counting_get(*_args: object, **_kwargs: object) -> _FakeResponse:
+        calls.append(url)
+        return _FakeResponse(SAMPLE_CONTENT)
+
+    with patch("poks.downloader.requests.get", counting_get), ThreadPoolExecutor(max_workers=4) as executor:
+        results = list(executor.map(lambda _: get_cached_or_download(url, SAMPLE_SHA256, cache_dir), range(4)))
+
+    assert len(calls) == 1
+    assert sorted(result.downloaded for result in results) == [False, False, False, True]
+    assert not _download_locks
+
+
 # -- cache collision avoidance ------------------------------------------------
 
 
-def test_cache_path_collision_avoidance(tmp_path: Path) -> None:
+def test_cache_path_collision_avoidance(cache_dir: Path) -> None:
     """Two URLs with the same filename produce distinct cache paths."""
-    cache_dir = tmp_path / "cache"
     path_a = _cache_path_for("https://example.com/v1/archive.tar.gz", cache_dir)
     path_b = _cache_path_for("https://example.com/v2/archive.tar.gz", cache_dir)
 
@@ -1,7 +1,9 @@
+import gzip
+import io
 import json
 import tarfile
 import zipfile
-from io import BytesIO
+from collections.abc import Callable
 from pathlib import Path
 from typing import Literal, cast
 from unittest.mock import patch
@@ -10,16 +12,18 @@ import py7zr
 import pytest
 import zstandard
 
-from poks.extractor import _rename_with_retry, extract_archive
+from poks.extractor import _entry_path_validator, _rename_with_retry, _validate_entry_paths, extract_archive
+from tests.helpers import add_tar_entries, write_conda_package
 
 HELLO_CONTENT = "hello poks"
 NESTED_CONTENT = "nested file"
 CONDA_PLACEHOLDER = "/opt/anaconda1anaconda2anaconda3"
+DATA_DIR = Path(__file__).parent / "data"
 
 
 def _create_zip(path: Path, top_dir: str | None = None) -> Path:
     archive = path / ("archive.zip")
-    with zipfile.ZipFile(archive, "w") as zf:
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
         prefix = f"{top_dir}/" if top_dir else ""
         zf.writestr(f"{prefix}hello.txt", HELLO_CONTENT)
     return archive
@@ -27,42 +31,37 @@ def _create_zip(path: Path, top_dir: str | None = None) -> Path:
 
 def _create_tar(path: Path, compression: str, ext: str, top_dir: str | None = None) -> Path:
     archive = path / f"archive{ext}"
-    mode = cast(Literal["w:gz", "w:xz", "w:bz2"], f"w:{compression}")
-    with tarfile.open(archive, mode) as tf:
+    mode = cast(Literal["w|gz", "w|xz", "w|bz2"], f"w|{compression}")
+    with archive.open("wb") as fh, tarfile.open(fileobj=fh, mode=mode, bufsize=64 * 1024) as tf:
         prefix = f"{top_dir}/" if top_dir else ""
-        info = tarfile.TarInfo(name=f"{prefix}hello.txt")
-        data = HELLO_CONTENT.encode()
-        info.size = len(data)
-        tf.addfile(info, BytesIO(data))
+        add_tar_entries(tf, {f"{prefix}hello.txt": HELLO_CONTENT.encode()})
     return archive
 
 
+def _create_tar_zst(path: Path, top_dir: str | None = None) -> Path:
+    archive = path / "archive.tar.zst"
+    prefix = f"{top_dir}/" if top_dir else ""
+    with archive.open("wb") as fh, zstandard.ZstdCompressor().stream_writer(fh) as compressor, tarfile.open(fileobj=compressor, mode="w|") as tf:
+        add_tar_entries(tf, {f"{prefix}hello.txt": HELLO_CONTENT.encode()})
+    return archive
+
+
+def _golden_or_create_tar(path: Path, compression: str, ext: str, top_dir: str | None = None) -> Path:
+    """Return the checked-in ``hello.txt`` archive for slow codecs; only variants without a golden file are encoded."""
+    golden = DATA_DIR / f"archive{ext}"
+    if top_dir or not golden.exists():
+        return _create_tar(path, compression, ext, top_dir=top_dir)
+    return golden
+
+
 def _create_7z(path: Path, top_dir: str | None = None) -> Path:
     archive = path / "archive.7z"
-    src_dir = path / "src_7z"
-    if top_dir:
-        (src_dir / top_dir).mkdir(parents=True)
-        (src_dir / top_dir / "hello.txt").write_text(HELLO_CONTENT)
-    else:
-        src_dir.mkdir(parents=True)
-        (src_dir / "hello.txt").write_text(HELLO_CONTENT)
+    prefix = f"{top_dir}/" if top_dir else ""
     with py7zr.SevenZipFile(archive, "w") as sz:
-        for file in src_dir.rglob("*"):
-            sz.write(file, file.relative_to(src_dir))
+        sz.writestr(HELLO_CONTENT, f"{prefix}hello.txt")
     return archive
 
 
-def _make_tar_zst(files: dict[str, bytes]) -> bytes:
-    tar_buf = BytesIO()
-    with tarfile.open(fileobj=tar_buf, mode="w:") as tf:
-        for name, data in files.items():
-            info = tarfile.TarInfo(name=name)
-            info.size = len(data)
-            tf.addfile(info, BytesIO(data))
-    cctx = zstandard.ZstdCompressor()
-    return cctx.compress(tar_buf.getvalue())
-
-
 def _create_conda(
     path: Path,
     top_dir: str | None = None,
@@ -72,84 +71,149 @@ def _create_conda(
     if pkg_files is None:
         prefix = f"{top_dir}/" if top_dir else ""
         pkg_files = {f"{prefix}hello.txt": HELLO_CONTENT.encode()}
-    pkg_tar_zst = _make_tar_zst(pkg_files)
-
-    paths_json = json.dumps({"paths": patches or []}).encode()
-    info_tar_zst = _make_tar_zst({"paths.json": paths_json})
-
     archive = path / "archive.conda"
-    with zipfile.ZipFile(archive, "w") as zf:
-        zf.writestr("metadata.json", json.dumps({"conda_pkg_format_version": 2}))
-        zf.writestr("pkg-test-1.0-h0_0.tar.zst", pkg_tar_zst)
-        zf.writestr("info-test-1.0-h0_0.tar.zst", info_tar_zst)
+    write_conda_package(archive, pkg_files, {"paths.json": json.dumps({"paths": patches or []}).encode()})
     return archive
 
 
 # -- parametrized extraction tests -------------------------------------------
 
-ARCHIVE_CREATORS = [
-    ("zip", lambda p: _create_zip(p)),
-    ("tar.gz", lambda p: _create_tar(p, "gz", ".tar.gz")),
-    ("tar.xz", lambda p: _create_tar(p, "xz", ".tar.xz")),
-    ("tar.bz2", lambda p: _create_tar(p, "bz2", ".tar.bz2")),
-    ("7z", lambda p: _create_7z(p)),
-    ("conda", lambda p: _create_conda(p)),
-]
+ARCHIVE_BUILDERS: dict[str, Callable[[Path, str | None], Path]] = {
+    "zip": lambda p, td: _create_zip(p, top_dir=td),
+    "tar.gz": lambda p, td: _create_tar(p, "gz", ".tar.gz", top_dir=td),
+    "tar.xz": lambda p, td: _golden_or_create_tar(p, "xz", ".tar.xz", top_dir=td),
+    "tar.bz2": lambda p, td: _golden_or_create_tar(p, "bz2", ".tar.bz2", top_dir=td),
+    "tar.zst": lambda p, td: _create_tar_zst(p, top_dir=td),
+    "7z": lambda p, td: _create_7z(p, top_dir=td),
+    "conda": lambda p, td: _create_conda(p, top_dir=td),
+}
 
 
-@pytest.mark.parametrize(("label", "creator"), ARCHIVE_CREATORS, ids=[a[0] for a in ARCHIVE_CREATORS])
-def test_extract_archive(tmp_path, label, creator):
-    archive = creator(tmp_path)
+@pytest.fixture(scope="session")
+def archive_cache(tmp_path_factory: pytest.TempPathFactory) -> Callable[..., Path]:
+    """Build each ``(format, top_dir)`` archive once per session; extraction only reads it."""
+    cache: dict[tuple[str, str | None], Path] = {}
+
+    def get(label: str, top_dir: str | None = None) -> Path:
+        key = (label, top_dir)
+        if key not in cache:
+            cache[key] = ARCHIVE_BUILDERS[label](tmp_path_factory.mktemp("archives"), top_dir)
+        return cache[key]
+
+    return get
+
+
+@pytest.mark.parametrize("label", list(ARCHIVE_BUILDERS))
+def test_extract_archive(tmp_path, archive_cache, label):
     dest = tmp_path / "out"
-    result = extract_archive(archive, dest)
+    result = extract_archive(archive_cache(label), dest)
     assert result == dest
     assert (dest / "hello.txt").read_text() == HELLO_CONTENT
 
 
-EXTRACT_DIR_CREATORS = [
-    ("zip", lambda p, td: _create_zip(p, top_dir=td)),
-    ("tar.gz", lambda p, td: _create_tar(p, "gz", ".tar.gz", top_dir=td)),
-    ("7z", lambda p, td: _create_7z(p, top_dir=td)),
-]
-
-
-@pytest.mark.parametrize(("label", "creator"), EXTRACT_DIR_CREATORS, ids=[a[0] for a in EXTRACT_DIR_CREATORS])
-def test_extract_dir_relocates_contents(tmp_path, label, creator):
-    archive = creator(tmp_path, "nested-dir")
+@pytest.mark.parametrize("label", ["zip", "tar.gz", "tar.zst", "7z"])
+def test_extract_dir_relocates_contents(tmp_path, archive_cache, label):
     dest = tmp_path / "out"
-    result = extract_archive(archive, dest, extract_dir="nested-dir")
+    result = extract_archive(archive_cache(label, "nested-dir"), dest, extract_dir="nested-dir")
     assert result == dest
     assert (dest / "hello.txt").read_text() == HELLO_CONTENT
     assert not (dest / "nested-dir").exists()
 
 
-def test_extract_dir_missing_raises(tmp_path):
-    archive = _create_zip(tmp_path)
+def test_tar_progress_reports_compressed_bytes(tmp_path, archive_cache):
+    archive = archive_cache("tar.gz")
+    calls: list[tuple[str, int, int | None]] = []
+    extract_archive(archive, tmp_path / "out", progress_callback=lambda *call: calls.append(call), app_name="tool")
+    size = archive.stat().st_size
+    assert calls[-1] == ("tool", size, size)
+    assert all(current < size for _, current, _ in calls[:-1])
+
+
+def test_extract_dir_missing_raises(tmp_path, archive_cache):
     dest = tmp_path / "out"
     with pytest.raises(ValueError, match="not found in extracted archive"):
-        extract_archive(archive, dest, extract_dir="nonexistent")
+        extract_archive(archive_cache("zip"), dest, extract_dir="nonexistent")
 
 
-def test_extract_dir_traversal_rejected(tmp_path):
-    archive = _create_zip(tmp_path)
+@pytest.mark.parametrize("fmt", ["tar.gz", "zip"])
+def test_extract_dir_naming_a_file_raises(tmp_path, fmt):
+    archive = tmp_path / f"archive.{fmt}"
+    if fmt == "zip":
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("nested-dir", HELLO_CONTENT)
+    else:
+        with tarfile.open(str(archive), "w|gz") as tf:
+            add_tar_entries(tf, {"nested-dir": HELLO_CONTENT.encode()})
+    with pytest.raises(ValueError, match="not found in extracted archive"):
+        extract_archive(archive, tmp_path / "out", extract_dir="nested-dir")
+
+
+def test_extract_dir_traversal_rejected(tmp_path, archive_cache):
     dest = tmp_path / "out"
     with pytest.raises(ValueError, match="escapes destination directory"):
-        extract_archive(archive, dest, extract_dir="../escape")
+        extract_archive(archive_cache("zip"), dest, extract_dir="../escape")
 
 
 def test_extract_dir_with_same_name_child(tmp_path):
     """Relocation must work when extract_dir contains a child with the same name."""
     archive = tmp_path / "archive.tar.xz"
-    with tarfile.open(archive, "w:xz") as tf:
-        info = tarfile.TarInfo(name="toolchain/toolchain/hello.txt")
-        data = HELLO_CONTENT.encode()
-        info.size = len(data)
-        tf.addfile(info, BytesIO(data))
+    with tarfile.open(str(archive), "w|xz") as tf:
+        add_tar_entries(tf, {"toolchain/toolchain/hello.txt": HELLO_CONTENT.encode()})
     dest = tmp_path / "out"
     extract_archive(archive, dest, extract_dir="toolchain")
     assert (dest / "toolchain" / "hello.txt").read_text() == HELLO_CONTENT
 
 
+def test_extract_dir_rebases_hardlinks_and_keeps_outside_entries(tmp_path):
+    archive = tmp_path / "archive.tar.gz"
+    with tarfile.open(str(archive), "w|gz") as tf:
+        add_tar_entries(tf, {"tool-1.0/bin/tool": b"binary", "LICENSE": b"license"})
+        link = tarfile.TarInfo(name="tool-1.0/bin/tool-alias")
+        link.type = tarfile.LNKTYPE
+        link.linkname = "tool-1.0/bin/tool"
+        tf.addfile(link)
+    dest = tmp_path / "out"
+    extract_archive(archive, dest, extract_dir="tool-1.0")
+    assert (dest / "bin" / "tool-alias").read_bytes() == b"binary"
+    assert (dest / "LICENSE").read_bytes() == b"license"
+    assert not (dest / "tool-1.0").exists()
+
+
+def _symlink_tar_bytes() -> bytes:
+    out = io.BytesIO()
+    with tarfile.open(fileobj=out, mode="w") as tf:
+        add_tar_entries(tf, {"real.txt": HELLO_CONTENT.encode()})
+        link = tarfile.TarInfo(name="link.txt")
+        link.type = tarfile.SYMTYPE
+        link.linkname = "real.txt"
+        tf.addfile(link)
+    return out.getvalue()
+
+
+def _write_symlink_archive(path: Path, fmt: str) -> Path:
+    tar_bytes = _symlink_tar_bytes()
+    archive = path / f"archive.{fmt}"
+    if fmt == "tar.gz":
+        archive.write_bytes(gzip.compress(tar_bytes))
+    elif fmt == "tar.zst":
+        archive.write_bytes(zstandard.ZstdCompressor().compress(tar_bytes))
+    else:
+        with zipfile.ZipFile(archive, "w") as zf:
+            zf.writestr("pkg-test-1.0-h0_0.tar.zst", zstandard.ZstdCompressor().compress(tar_bytes))
+    return archive
+
+
+@pytest.mark.parametrize("fmt", ["tar.gz", "tar.zst", "conda"])
+def test_symlink_falls_back_to_copy_when_symlinks_unavailable(tmp_path, fmt):
+    """Without symlink support (e.g. Windows without the privilege) tarfile copies the link target, which needs seeking."""
+    archive = _write_symlink_archive(tmp_path, fmt)
+    dest = tmp_path / "out"
+    with patch("os.symlink", side_effect=OSError("symlinks not permitted")):
+        extract_archive(archive, dest)
+    assert (dest / "real.txt").read_text() == HELLO_CONTENT
+    assert (dest / "link.txt").read_text() == HELLO_CONTENT
+
+
 def test_unsupported_format_raises(tmp_path):
     fake = tmp_path / "archive.rar"
     fake.write_text("not real")
@@ -162,18 +226,15 @@ def test_unsupported_format_raises(tmp_path):
 
 def _create_zip_with_traversal(path: Path) -> Path:
     archive = path / "malicious.zip"
-    with zipfile.ZipFile(archive, "w") as zf:
+    with zipfile.ZipFile(archive, "w", compression=zipfile.ZIP_STORED) as zf:
         zf.writestr("../escape.txt", "pwned")
     return archive
 
 
 def _create_tar_with_traversal(path: Path) -> Path:
     archive = path / "malicious.tar.gz"
-    with tarfile.open(archive, "w:gz") as tf:
-        info = tarfile.TarInfo(name="../escape.txt")
-        data = b"pwned"
-        info.size = len(data)
-        tf.addfile(info, BytesIO(data))
+    with tarfile.open(str(archive), "w|gz") as tf:
+        add_tar_entries(tf, {"../escape.txt": b"pwned"})
     return archive
 
 
@@ -184,6 +245,18 @@ def test_zip_path_traversal_rejected(tmp_path):
         extract_archive(archive, dest)
 
 
+@pytest.mark.parametrize("name", ["../escape.txt", "nested/../../escape.txt", "/abs/escape.txt"])
+@pytest.mark.parametrize("populated", [False, True])
+def test_validate_entry_paths_rejects_escape(tmp_path, name, populated):
+    dest = tmp_path / "out"
+    dest.mkdir()
+    if populated:
+        (dest / "existing.txt").write_text("data")
+    _validate_entry_paths(["ok/file.txt", "./top.txt"], dest)
+    with pytest.raises(ValueError, match="Path traversal detected"):
+        _validate_entry_paths([name], dest)
+
+
 def test_tar_path_traversal_rejected(tmp_path):
     archive = _create_tar_with_traversal(tmp_path)
     dest = tmp_path / "out"
@@ -194,6 +267,16 @@ def test_tar_path_traversal_rejected(tmp_path):
         extract_archive(archive, dest)
 
 
+def test_tar_without_data_filter_picks_path_check_once(tmp_path, monkeypatch):
+    archive = tmp_path / "multi.tar.gz"
+    with tarfile.open(str(archive), "w|gz") as tf:
+        add_tar_entries(tf, {"a.txt": b"a", "b.txt": b"b", "../escape.txt": b"pwned"})
+    monkeypatch.setattr("poks.extractor._HAS_TAR_DATA_FILTER", False)
+    with patch("poks.extractor._entry_path_validator", wraps=_entry_path_validator) as validator_mock, pytest.raises(ValueError, match="Path traversal detected"):
+        extract_archive(archive, tmp_path / "out")
+    validator_mock.assert_called_once()
+
+
 # -- .conda-specific tests ---------------------------------------------------
 
 
@@ -213,14 +296,8 @@ def test_extract_conda_applies_text_poking(tmp_path):
 
 
 def test_extract_conda_no_paths_json(tmp_path):
-    pkg_tar_zst = _make_tar_zst({"hello.txt": HELLO_CONTENT.encode()})
-    info_tar_zst = _make_tar_zst({})
-
     archive = tmp_path / "archive.conda"
-    with zipfile.ZipFile(archive, "w") as zf:
-        zf.writestr("metadata.json", json.dumps({"conda_pkg_format_version": 2}))
-        zf.writestr("pkg-test-1.0-h0_0.tar.zst", pkg_tar_zst)
-        zf.writestr("info-test-1.0-h0_0.tar.zst", info_tar_zst)
+    write_conda_package(archive, {"hello.txt": HELLO_CONTENT.encode()}, {})
 
     dest = tmp_path / "out"
     extract_archive(archive, dest)
@@ -262,15 +339,8 @@ def test_rename_with_retry_raises_after_exhausting_retries(tmp_path):
 
 
 def test_conda_path_traversal_in_inner_tar_rejected(tmp_path):
-    malicious_files = {"../escape.txt": b"pwned"}
-    pkg_tar_zst = _make_tar_zst(malicious_files)
-    info_tar_zst = _make_tar_zst({"paths.json": json.dumps({"paths": []}).encode()})
-
     archive = tmp_path / "malicious.conda"
-    with zipfile.ZipFile(archive, "w") as zf:
-        zf.writestr("metadata.json", json.dumps({"conda_pkg_format_version": 2}))
-        zf.writestr("pkg-test-1.0-h0_0.tar.zst", pkg_tar_zst)
-        zf.writestr("info-test-1.0-h0_0.tar.zst", info_tar_zst)
+    write_conda_package(archive, {"../escape.txt": b"pwned"}, {"paths.json": json.dumps({"paths": []}).encode()})
 
     dest = tmp_path / "out"
     _outside = getattr(tarfile, "OutsideDestinationError", ValueError)
@@ -8,6 +8,7 @@ from unittest.mock import patch
 
 import pytest
 
+from poks.bucket import get_bucket_id
 from poks.domain import PoksApp, PoksAppVersion, PoksArchive, PoksBucket, PoksConfig, PoksManifest
 from poks.poks import Poks
 from tests.helpers import assert_install_result, assert_installed_app, create_archive
@@ -20,15 +21,15 @@ def _setup_bucket(
     """Write manifest JSON files directly into a bucket directory (no git)."""
     bucket_dir.mkdir(parents=True, exist_ok=True)
     for name, manifest in manifests.items():
-        (bucket_dir / f"{name}.json").write_text(manifest.to_json_string())
+        (bucket_dir / f"{name}.json").write_text(json.dumps(manifest.to_dict()))
 
 
 @pytest.fixture
 def install_env(tmp_path: Path) -> tuple[Poks, Path, Path]:
     """Provide a Poks instance and helper directories for install tests."""
     root_dir = tmp_path / ".poks"
-    for sub in ("apps", "buckets", "cache"):
-        (root_dir / sub).mkdir(parents=True)
+    for directory in (root_dir, root_dir / "apps", root_dir / "buckets", root_dir / "cache"):
+        directory.mkdir()
     archives_dir = tmp_path / "archives"
     archives_dir.mkdir()
     return Poks(root_dir=root_dir), root_dir, archives_dir
@@ -110,6 +111,8 @@ def test_full_install_end_to_end(
     assert app.install_dir == install_dir
     assert install_dir / "bin" in app.bin_dirs
     assert app.env["TOOL_HOME"] == str(install_dir)
+    assert PoksManifest.from_json_file(install_dir / ".manifest.json") == manifest
+    assert json.loads((install_dir / ".receipt.json").read_text()) == {"bucket_id": get_bucket_id("unused"), "bucket_name": "test", "bucket_url": "unused"}
 
 
 def test_install_accepts_path(
@@ -197,6 +200,92 @@ def test_idempotency_skips_installed(
     assert app.bin_dirs == [install_dir / "bin"]
 
 
+def test_already_installed_apps_resolved_from_stored_manifest(
+    install_env: tuple[Poks, Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    poks, root_dir, archives_dir = install_env
+    manifest = _make_manifest(archives_dir, bin_dirs=["bin"])
+    bucket_dir = root_dir / "buckets" / "test"
+    _setup_bucket(bucket_dir, {"my-tool": manifest})
+    install_dir = root_dir / "apps" / "my-tool" / "1.0.0"
+    install_dir.mkdir(parents=True)
+    (install_dir / ".manifest.json").write_text(manifest.to_json_string())
+
+    config = PoksConfig(
+        buckets=[PoksBucket(name="test", url="unused")],
+        apps=[PoksApp(name="my-tool", version="1.0.0", bucket="test")],
+    )
+
+    with PLATFORM_PATCH, patch("poks.poks.PoksManifest.from_json_file") as load_manifest_mock:
+        monkeypatch.setattr("poks.poks.sync_all_buckets", lambda _buckets, _dir: {"test": bucket_dir})
+        result = poks.install(config)
+
+    load_manifest_mock.assert_not_called()
+    app = assert_installed_app(result, "my-tool")
+    assert app.bin_dirs == [install_dir / "bin"]
+    assert not app.extracted
+
+
+def test_corrupt_stored_manifest_falls_back_to_source_manifest(
+    install_env: tuple[Poks, Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    poks, root_dir, archives_dir = install_env
+    bucket_dir = root_dir / "buckets" / "test"
+    _setup_bucket(bucket_dir, {"my-tool": _make_manifest(archives_dir, bin_dirs=["bin"])})
+    install_dir = root_dir / "apps" / "my-tool" / "1.0.0"
+    install_dir.mkdir(parents=True)
+    (install_dir / ".manifest.json").write_text("{")
+
+    config = PoksConfig(
+        buckets=[PoksBucket(name="test", url="unused")],
+        apps=[PoksApp(name="my-tool", version="1.0.0", bucket="test")],
+    )
+
+    with PLATFORM_PATCH:
+        monkeypatch.setattr("poks.poks.sync_all_buckets", lambda _buckets, _dir: {"test": bucket_dir})
+        result = poks.install(config)
+
+    assert (install_dir / ".manifest.json").read_text() == "{"
+    app = assert_installed_app(result, "my-tool")
+    assert app.bin_dirs == [install_dir / "bin"]
+    assert not app.extracted
+
+
+@pytest.mark.parametrize(
+    ("app_name", "bucket", "error", "match"),
+    [
+        ("my-tool", "removed", ValueError, "Bucket 'removed' not found"),
+        ("removed-tool", "test", FileNotFoundError, "Manifest 'removed-tool.json' not found"),
+    ],
+)
+def test_already_installed_app_with_missing_source_raises(
+    install_env: tuple[Poks, Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+    app_name: str,
+    bucket: str,
+    error: type[Exception],
+    match: str,
+) -> None:
+    poks, root_dir, archives_dir = install_env
+    manifest = _make_manifest(archives_dir, bin_dirs=["bin"])
+    bucket_dir = root_dir / "buckets" / "test"
+    _setup_bucket(bucket_dir, {"my-tool": manifest})
+    install_dir = root_dir / "apps" / app_name / "1.0.0"
+    install_dir.mkdir(parents=True)
+    (install_dir / ".manifest.json").write_text(manifest.to_json_string())
+
+    config = PoksConfig(
+        buckets=[PoksBucket(name="test", url="unused")],
+        apps=[PoksApp(name=app_name, version="1.0.0", bucket=bucket)],
+    )
+
+    with PLATFORM_PATCH, pytest.raises(error, match=match):
+        monkeypatch.setattr("poks.poks.sync_all_buckets", lambda _buckets, _dir: {"test": bucket_dir})
+        poks.install(config)
+
+
 def test_multiple_apps_env_merged(
     install_env: tuple[Poks, Path, Path],
     monkeypatch: pytest.MonkeyPatch,
@@ -346,6 +435,27 @@ def test_parallel_install_with_progress_callback(
     assert reported_names == {"tool-a", "tool-b"}
 
 
+def test_parallel_install_propagates_first_failure(
+    install_env: tuple[Poks, Path, Path],
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    poks, root_dir, archives_dir = install_env
+    bucket_dir = root_dir / "buckets" / "test"
+    _setup_bucket(bucket_dir, {"tool-a": _make_manifest(archives_dir)})
+
+    config = PoksConfig(
+        buckets=[PoksBucket(name="test", url="unused")],
+        apps=[
+            PoksApp(name="tool-a", version="1.0.0", bucket="test"),
+            PoksApp(name="tool-a", version="9.9.9", bucket="test"),
+        ],
+    )
+
+    with PLATFORM_PATCH, pytest.raises(ValueError, match=r"Version 9\.9\.9 not found"):
+        monkeypatch.setattr("poks.poks.sync_all_buckets", lambda _buckets, _dir: {"test": bucket_dir})
+        poks.install(config)
+
+
 def test_yanked_version_raises(
     install_env: tuple[Poks, Path, Path],
     monkeypatch: pytest.MonkeyPatch,
@@ -389,6 +499,27 @@ def test_install_from_manifest(
     assert installed.env["TOOL_HOME"] == str(installed.install_dir)
 
 
+def test_install_from_manifest_already_installed_revalidates_source(
+    install_env: tuple[Poks, Path, Path],
+) -> None:
+    poks, _root_dir, archives_dir = install_env
+    manifest = _make_manifest(archives_dir, bin_dirs=["bin"])
+    manifest_path = archives_dir / "my-tool.json"
+    manifest_path.write_text(manifest.to_json_string())
+
+    with PLATFORM_PATCH:
+        first = poks.install_from_manifest(manifest_path, "1.0.0")
+        second = poks.install_from_manifest(manifest_path, "1.0.0")
+        manifest.versions[0].yanked = "broken build"
+        manifest_path.write_text(manifest.to_json_string())
+        with pytest.raises(ValueError, match="yanked"):
+            poks.install_from_manifest(manifest_path, "1.0.0")
+
+    assert first.extracted
+    assert not second.extracted
+    assert second.bin_dirs == first.bin_dirs
+
+
 def test_install_from_manifest_version_not_found(
     install_env: tuple[Poks, Path, Path],
 ) -> None:
@@ -2,12 +2,13 @@
 
 from __future__ import annotations
 
-from git import Repo
+import json
 
 from poks.domain import PoksAppVersion, PoksArchive, PoksConfig, PoksManifest
 from poks.downloader import get_cached_or_download
 from poks.extractor import extract_archive
 from tests.conftest import PoksEnv
+from tests.helpers import read_test_bucket_file
 
 
 def test_full_flow_create_bucket_add_manifest_extract(poks_env: PoksEnv) -> None:
@@ -26,12 +27,8 @@ def test_full_flow_create_bucket_add_manifest_extract(poks_env: PoksEnv) -> None
     )
     poks_env.add_manifest("my-tool", manifest)
 
-    # Clone the bucket and verify the manifest is there
-    clone_dir = poks_env.root_dir / "bucket-verify"
-    Repo.clone_from(poks_env.bucket_url, str(clone_dir))
-    manifest_file = clone_dir / "my-tool.json"
-    assert manifest_file.exists()
-    loaded = PoksManifest.from_json_file(manifest_file)
+    # Read the committed manifest straight from the bucket repository
+    loaded = PoksManifest.from_dict(json.loads(read_test_bucket_file(poks_env.root_dir / "bucket-src", "my-tool.json")))
     assert loaded.versions[0].version == "1.0.0"
     assert loaded.versions[0].archives[0].sha256 == sha256
 
@@ -96,13 +93,10 @@ def test_download_verify_cache_flow(poks_env: PoksEnv) -> None:
 
 
 def test_uninstall_specific_version(poks_env: PoksEnv) -> None:
+    poks_env.make_app_tree({"my-tool/1.0.0/file.txt": "version 1", "my-tool/2.0.0/file.txt": "version 2"})
     app_dir = poks_env.apps_dir / "my-tool"
     v1_dir = app_dir / "1.0.0"
     v2_dir = app_dir / "2.0.0"
-    v1_dir.mkdir(parents=True)
-    v2_dir.mkdir(parents=True)
-    (v1_dir / "file.txt").write_text("version 1")
-    (v2_dir / "file.txt").write_text("version 2")
 
     poks_env.poks.uninstall("my-tool", "1.0.0")
 
@@ -112,10 +106,9 @@ def test_uninstall_specific_version(poks_env: PoksEnv) -> None:
 
 
 def test_uninstall_specific_version_cleans_up_parent(poks_env: PoksEnv) -> None:
+    poks_env.make_app_tree({"my-tool/1.0.0/file.txt": "data"})
     app_dir = poks_env.apps_dir / "my-tool"
     version_dir = app_dir / "1.0.0"
-    version_dir.mkdir(parents=True)
-    (version_dir / "file.txt").write_text("data")
 
     poks_env.poks.uninstall("my-tool", "1.0.0")
 
@@ -124,15 +117,9 @@ def test_uninstall_specific_version_cleans_up_parent(poks_env: PoksEnv) -> None:
 
 
 def test_uninstall_all_versions(poks_env: PoksEnv) -> None:
+    poks_env.make_app_tree({"my-tool/1.0.0/file.txt": "v1", "my-tool/2.0.0/file.txt": "v2", "other-tool/1.0.0/file.txt": "other"})
     my_tool_dir = poks_env.apps_dir / "my-tool"
-    (my_tool_dir / "1.0.0").mkdir(parents=True)
-    (my_tool_dir / "2.0.0").mkdir(parents=True)
-    (my_tool_dir / "1.0.0" / "file.txt").write_text("v1")
-    (my_tool_dir / "2.0.0" / "file.txt").write_text("v2")
-
     other_tool_dir = poks_env.apps_dir / "other-tool"
-    (other_tool_dir / "1.0.0").mkdir(parents=True)
-    (other_tool_dir / "1.0.0" / "file.txt").write_text("other")
 
     poks_env.poks.uninstall("my-tool")
 
@@ -141,14 +128,7 @@ def test_uninstall_all_versions(poks_env: PoksEnv) -> None:
 
 
 def test_uninstall_all_apps(poks_env: PoksEnv) -> None:
-    tool1_dir = poks_env.apps_dir / "tool1"
-    tool2_dir = poks_env.apps_dir / "tool2"
-    (tool1_dir / "1.0.0").mkdir(parents=True)
-    (tool2_dir / "1.0.0").mkdir(parents=True)
-    (tool2_dir / "2.0.0").mkdir(parents=True)
-    (tool1_dir / "1.0.0" / "file.txt").write_text("data1")
-    (tool2_dir / "1.0.0" / "file.txt").write_text("data2")
-    (tool2_dir / "2.0.0" / "file.txt").write_text("data3")
+    poks_env.make_app_tree({"tool1/1.0.0/file.txt": "data1", "tool2/1.0.0/file.txt": "data2", "tool2/2.0.0/file.txt": "data3"})
 
     poks_env.poks.uninstall(all_apps=True)
 
@@ -161,10 +141,8 @@ def test_uninstall_nonexistent_app_logs_warning(poks_env: PoksEnv) -> None:
 
 
 def test_uninstall_nonexistent_version_logs_warning(poks_env: PoksEnv) -> None:
-    app_dir = poks_env.apps_dir / "my-tool"
-    version_dir = app_dir / "1.0.0"
-    version_dir.mkdir(parents=True)
-    (version_dir / "file.txt").write_text("data")
+    poks_env.make_app_tree({"my-tool/1.0.0/file.txt": "data"})
+    version_dir = poks_env.apps_dir / "my-tool" / "1.0.0"
 
     poks_env.poks.uninstall("my-tool", "2.0.0")  # should not raise
 
@@ -178,10 +156,7 @@ def test_uninstall_nonexistent_app_wipe_still_removes_cache(poks_env: PoksEnv) -
 
 
 def test_uninstall_nonexistent_version_wipe_still_removes_cache(poks_env: PoksEnv) -> None:
-    app_dir = poks_env.apps_dir / "my-tool"
-    version_dir = app_dir / "1.0.0"
-    version_dir.mkdir(parents=True)
-    (version_dir / "file.txt").write_text("data")
+    poks_env.make_app_tree({"my-tool/1.0.0/file.txt": "data"})
 
     assert poks_env.cache_dir.exists()
     poks_env.poks.uninstall("my-tool", "2.0.0", wipe=True)
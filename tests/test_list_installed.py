@@ -39,6 +39,33 @@ def test_list_api_returns_installed_apps(poks_env: PoksEnv, tmp_path: Path) -> N
     assert result.env == {"MY_VAR": str(install_dir / "data")}
 
 
+def test_list_api_returns_every_app_and_version(poks_env: PoksEnv) -> None:
+    expected = {("tool-a", "1.0.0"), ("tool-a", "2.0.0"), ("tool-b", "1.0.0")}
+    for app_name, version in expected:
+        install_dir = poks_env.apps_dir / app_name / version
+        install_dir.mkdir(parents=True)
+        manifest = PoksManifest(description=app_name, versions=[PoksAppVersion(version=version, archives=[], bin_dirs=["bin"])])
+        (install_dir / ".manifest.json").write_text(manifest.to_json_string())
+
+    result = poks_env.poks.list_installed()
+
+    assert {(installed.name, installed.version) for installed in result.apps} == expected
+    assert all(installed.bin_dirs == [installed.install_dir / "bin"] for installed in result.apps)
+
+
+def test_list_api_rereads_rewritten_stored_manifest(poks_env: PoksEnv) -> None:
+    install_dir = poks_env.apps_dir / "edited-app" / "1.0.0"
+    install_dir.mkdir(parents=True)
+    for bin_dir in ("bin", "lib"):
+        # Same-size rewrites must not be served from a stale listing
+        manifest = PoksManifest(description="Edited App", versions=[PoksAppVersion(version="1.0.0", archives=[], bin_dirs=[bin_dir])])
+        (install_dir / ".manifest.json").write_text(manifest.to_json_string())
+
+        result = poks_env.poks.list_installed()
+
+        assert assert_installed_app(result, "edited-app").bin_dirs == [install_dir / bin_dir]
+
+
 def test_cli_list_command(poks_env: PoksEnv) -> None:
     """Test that 'poks list' prints the table of apps."""
     app_name = "cli-app"
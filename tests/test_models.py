@@ -1,6 +1,7 @@
 import json
 
 import pytest
+from mashumaro.exceptions import InvalidFieldValue
 
 from poks.domain import PoksApp, PoksAppVersion, PoksArchive, PoksBucket, PoksConfig, PoksManifest
 
@@ -43,11 +44,16 @@ SAMPLE_CONFIG = {
     ],
 }
 
+# Serialized once for the tests that exercise the on-disk parsers
+SAMPLE_MANIFEST_JSON = json.dumps(SAMPLE_MANIFEST)
+MINIMAL_MANIFEST_JSON = json.dumps(MINIMAL_MANIFEST)
+SAMPLE_CONFIG_JSON = json.dumps(SAMPLE_CONFIG)
+
 
 class TestPoksManifest:
     def test_from_json_file_full(self, tmp_path):
         path = tmp_path / "manifest.json"
-        path.write_text(json.dumps(SAMPLE_MANIFEST))
+        path.write_text(SAMPLE_MANIFEST_JSON)
         manifest = PoksManifest.from_json_file(path)
 
         assert manifest.description == "Zephyr SDK Bundle"
@@ -64,7 +70,7 @@ class TestPoksManifest:
 
     def test_from_json_file_minimal(self, tmp_path):
         path = tmp_path / "manifest.json"
-        path.write_text(json.dumps(MINIMAL_MANIFEST))
+        path.write_text(MINIMAL_MANIFEST_JSON)
         manifest = PoksManifest.from_json_file(path)
 
         assert manifest.description == "Minimal App"
@@ -76,7 +82,7 @@ class TestPoksManifest:
 
     def test_round_trip(self, tmp_path):
         path = tmp_path / "manifest.json"
-        path.write_text(json.dumps(SAMPLE_MANIFEST))
+        path.write_text(SAMPLE_MANIFEST_JSON)
         original = PoksManifest.from_json_file(path)
 
         out_path = tmp_path / "out.json"
@@ -85,25 +91,28 @@ class TestPoksManifest:
 
         assert original == reloaded
 
-    def test_round_trip_omits_none(self, tmp_path):
-        path = tmp_path / "manifest.json"
-        path.write_text(json.dumps(MINIMAL_MANIFEST))
-        manifest = PoksManifest.from_json_file(path)
+    def test_round_trip_omits_none(self):
+        manifest = PoksManifest.from_dict(MINIMAL_MANIFEST)
 
-        out_path = tmp_path / "out.json"
-        manifest.to_json_file(out_path)
-        raw = json.loads(out_path.read_text())
+        raw = json.loads(manifest.to_json_string())
 
         # description is required now
         assert "homepage" not in raw
         # bin_dirs is in versions
         assert "bin_dirs" not in raw["versions"][0]
 
+    def test_get_version(self):
+        manifest = PoksManifest.from_dict(SAMPLE_MANIFEST)
+
+        assert manifest.get_version("0.16.5-1") is manifest.versions[0]
+        assert manifest.get_version("9.9.9") is None
+        assert "versions_by_id" not in manifest.to_dict()
+
 
 class TestPoksConfig:
     def test_from_json_file(self, tmp_path):
         path = tmp_path / "poks.json"
-        path.write_text(json.dumps(SAMPLE_CONFIG))
+        path.write_text(SAMPLE_CONFIG_JSON)
         config = PoksConfig.from_json_file(path)
 
         assert len(config.buckets) == 2
@@ -112,14 +121,10 @@ class TestPoksConfig:
         assert config.apps[0].name == "cmake"
         assert config.apps[1].os == ["windows"]
 
-    def test_round_trip(self, tmp_path):
-        path = tmp_path / "poks.json"
-        path.write_text(json.dumps(SAMPLE_CONFIG))
-        original = PoksConfig.from_json_file(path)
+    def test_round_trip(self):
+        original = PoksConfig.from_dict(SAMPLE_CONFIG)
 
-        out_path = tmp_path / "out.json"
-        original.to_json_file(out_path)
-        reloaded = PoksConfig.from_json_file(out_path)
+        reloaded = PoksConfig.from_json(original.to_json_string())
 
         assert original == reloaded
 
@@ -142,11 +147,19 @@ def test_is_supported(os_filter, arch_filter, query_os, query_arch, expected):
     assert app.is_supported(query_os, query_arch) is expected
 
 
-def test_invalid_json(tmp_path):
+@pytest.mark.parametrize(
+    ("cls", "text", "exc"),
+    [
+        (PoksConfig, "not valid json", json.JSONDecodeError),
+        (PoksManifest, "not valid json", json.JSONDecodeError),
+        (PoksManifest, '{"description": "x", "versions": [{}]}', InvalidFieldValue),
+    ],
+)
+def test_invalid_json(tmp_path, cls, text, exc):
     path = tmp_path / "bad.json"
-    path.write_text("not valid json")
-    with pytest.raises(json.JSONDecodeError):
-        PoksConfig.from_json_file(path)
+    path.write_text(text)
+    with pytest.raises(exc):
+        cls.from_json_file(path)
 
 
 class TestResolveForArchive:
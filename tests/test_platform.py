@@ -2,11 +2,20 @@
 
 from __future__ import annotations
 
+from collections.abc import Iterator
+
 import pytest
 
 from poks.platform import get_current_platform
 
 
+@pytest.fixture(autouse=True)
+def _clear_platform_cache() -> Iterator[None]:
+    get_current_platform.cache_clear()
+    yield
+    get_current_platform.cache_clear()
+
+
 @pytest.mark.parametrize(
     ("sys_platform", "machine", "expected"),
     [
@@ -7,6 +7,11 @@ from poks.poker import PatchEntry, poke
 PLACEHOLDER = "/opt/anaconda1anaconda2anaconda3"
 # Binary tests need a placeholder longer than any realistic tmp_path (~120 chars on macOS)
 LONG_PLACEHOLDER = "/opt/" + "placeholder_" * 25  # ~305 chars
+LONG_PLACEHOLDER_BYTES = LONG_PLACEHOLDER.encode()
+BINARY_PAYLOAD = b"\x00\x00" + LONG_PLACEHOLDER_BYTES + b"\x00" * 50 + b"\xff\xff"
+WIN_LONG_PLACEHOLDER = "C:\\conda\\envs\\" + "placeholder_" * 25
+WIN_LONG_PLACEHOLDER_BYTES = WIN_LONG_PLACEHOLDER.encode()
+WIN_BINARY_PAYLOAD = WIN_LONG_PLACEHOLDER_BYTES + b"\x00" * 50
 
 
 def _write_file(base: Path, name: str, content: str | bytes) -> Path:
@@ -48,8 +53,7 @@ class TestTextMode:
 
 class TestBinaryMode:
     def test_replaces_placeholder_with_null_padding(self, tmp_path: Path) -> None:
-        binary_content = b"\x00\x00" + LONG_PLACEHOLDER.encode() + b"\x00" * 50 + b"\xff\xff"
-        _write_file(tmp_path, "lib/libfoo.so", binary_content)
+        _write_file(tmp_path, "lib/libfoo.so", BINARY_PAYLOAD)
         patches = [PatchEntry(path="lib/libfoo.so", prefix_placeholder=LONG_PLACEHOLDER, file_mode="binary")]
 
         poke(tmp_path, patches)
@@ -57,9 +61,9 @@ class TestBinaryMode:
         result = (tmp_path / "lib/libfoo.so").read_bytes()
         new_prefix = str(tmp_path).encode()
         assert new_prefix in result
-        assert LONG_PLACEHOLDER.encode() not in result
+        assert LONG_PLACEHOLDER_BYTES not in result
         # File size must not change
-        assert len(result) == len(binary_content)
+        assert len(result) == len(BINARY_PAYLOAD)
 
     def test_fails_when_prefix_exceeds_placeholder(self, tmp_path: Path) -> None:
         short_placeholder = "/x"
@@ -87,13 +91,11 @@ class TestWindowsDelimiters:
         assert str(tmp_path) in result
 
     def test_binary_backslash_replacement(self, tmp_path: Path) -> None:
-        win_placeholder = "C:\\conda\\envs\\" + "placeholder_" * 25
-        binary_content = win_placeholder.encode() + b"\x00" * 50
-        _write_file(tmp_path, "lib/foo.dll", binary_content)
-        patches = [PatchEntry(path="lib/foo.dll", prefix_placeholder=win_placeholder, file_mode="binary")]
+        _write_file(tmp_path, "lib/foo.dll", WIN_BINARY_PAYLOAD)
+        patches = [PatchEntry(path="lib/foo.dll", prefix_placeholder=WIN_LONG_PLACEHOLDER, file_mode="binary")]
 
         poke(tmp_path, patches)
 
         result = (tmp_path / "lib/foo.dll").read_bytes()
-        assert win_placeholder.encode() not in result
-        assert len(result) == len(binary_content)
+        assert WIN_LONG_PLACEHOLDER_BYTES not in result
+        assert len(result) == len(WIN_BINARY_PAYLOAD)
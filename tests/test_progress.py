@@ -0,0 +1,35 @@
+"""Unit tests for the progress module."""
+
+from unittest.mock import MagicMock
+
+from poks.progress import RichProgressHandler, _TaskState
+
+
+def test_intermediate_updates_are_coalesced() -> None:
+    handler = RichProgressHandler()
+    progress = MagicMock()
+
+    tasks: dict[str, _TaskState] = {}
+    for current in range(1, 101):
+        handler._update_task_locked(progress, tasks, "tool", current, 100)
+
+    progress.add_task.assert_called_once_with("tool", total=100)
+    completed = [call.kwargs["completed"] for call in progress.update.call_args_list if "completed" in call.kwargs]
+    assert completed[0] == 1
+    assert completed[-1] == 100
+    assert len(completed) < 100
+
+
+def test_bar_stops_after_last_task_finishes() -> None:
+    handler = RichProgressHandler()
+    progress = MagicMock()
+    tasks: dict[str, _TaskState] = {}
+
+    handler._update_task_locked(progress, tasks, "tool-a", 1, 10)
+    handler._update_task_locked(progress, tasks, "tool-b", 1, 10)
+
+    assert handler._update_task_locked(progress, tasks, "tool-a", 10, 10) is False
+    progress.stop.assert_not_called()
+    assert handler._update_task_locked(progress, tasks, "tool-b", 10, 10) is True
+    progress.stop.assert_called_once()
+    assert tasks == {}
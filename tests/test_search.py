@@ -7,6 +7,7 @@ import pytest
 from typer.testing import CliRunner
 
 from poks.main import app
+from poks.poks import Poks
 
 
 @pytest.fixture
@@ -94,3 +95,19 @@ def test_search_no_update_flag(runner: CliRunner, mock_buckets_dir: Path, tmp_pa
 
         assert result.exit_code == 0
         mock_repo.assert_not_called()
+
+
+def test_search_picks_up_new_manifest_between_calls(mock_buckets_dir: Path, tmp_path: Path) -> None:
+    poks = Poks(root_dir=tmp_path)
+    assert poks.search("new", update=False) == []
+
+    bucket1 = mock_buckets_dir / "bucket1"
+    (bucket1 / "new-app.json").touch()
+
+    assert poks.search("new", update=False) == ["new-app"]
+
+
+def test_search_ignores_bare_json_file(mock_buckets_dir: Path, tmp_path: Path) -> None:
+    (mock_buckets_dir / "bucket1" / ".json").touch()
+
+    assert "" not in Poks(root_dir=tmp_path).search("", update=False)